@@ -19,7 +19,10 @@ def pytest_configure(config: pytest.Config) -> None:
     log_dir = Path(__file__).parent / "log"
     log_dir.mkdir(parents=True, exist_ok=True)
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    log_file = log_dir / f"pytest_{timestamp}.log"
+    # pytest-xdist workers each get their own file instead of sharing one.
+    worker_id = getattr(config, "workerinput", {}).get("workerid")
+    suffix = f"_{worker_id}" if worker_id else ""
+    log_file = log_dir / f"pytest_{timestamp}{suffix}.log"
     config.option.log_file = str(log_file)
     config.option.log_file_level = "DEBUG"
     config.option.log_file_format = "%(asctime)s [%(levelname)s] %(name)s %(message)s"
@@ -14,13 +14,13 @@ Silent install switches:
     /quiet InstallAllUsers=0 PrependPath=1 TargetDir=<path>
 """
 
+from __future__ import annotations
+
 import os
-import subprocess
-import urllib.request
 import shutil
 import sys
 from pathlib import Path
-from typing import Optional
+from typing import TYPE_CHECKING, Optional
 
 from .exceptions import (
     PythonInstallerInstallError,
@@ -30,6 +30,12 @@ from .exceptions import (
 )
 from lib.logger import get_module_logger
 
+if TYPE_CHECKING:
+    import subprocess
+
+# subprocess and urllib.request are imported inside the methods that use
+# them so importing this module (e.g. during test collection) stays cheap.
+
 logger = get_module_logger(__name__)
 
 _DOWNLOAD_URL_TEMPLATE = (
@@ -74,6 +80,11 @@ class PythonInstallerProcessManager:
         self._resolved_installer_path: str = installer_path
         self._process: Optional[subprocess.Popen] = None
 
+        # Network seams; tests replace these directly instead of patching
+        # urllib.  None means "use urllib.request" (imported on first use).
+        self._urlopen = None
+        self._urlretrieve = None
+
     # ------------------------------------------------------------------
     # Public API
     # ------------------------------------------------------------------
@@ -91,6 +102,8 @@ class PythonInstallerProcessManager:
             logger.debug(f"is_installed check: {exe} -> {installed}")
             return installed
 
+        import subprocess
+
         # Fallback: query py launcher
         major_minor = '.'.join(self.version.split('.')[:2])
         try:
@@ -140,6 +153,8 @@ class PythonInstallerProcessManager:
             exe = Path(self.install_path) / 'python.exe'
             return str(exe) if exe.is_file() else ''
 
+        import subprocess
+
         major_minor = '.'.join(self.version.split('.')[:2])
         try:
             result = subprocess.run(
@@ -177,9 +192,12 @@ class PythonInstallerProcessManager:
             full_version=candidate, arch=self.architecture
         )
         logger.info(f"Checking installer URL: {url}")
+        import urllib.request
+
+        urlopen = self._urlopen or urllib.request.urlopen
         try:
             req = urllib.request.Request(url, method='HEAD')
-            urllib.request.urlopen(req, timeout=10)
+            urlopen(req, timeout=10)
             self.full_version = candidate
         except Exception as exc:
             logger.warning(
@@ -216,8 +234,11 @@ class PythonInstallerProcessManager:
             full_version=self.full_version, arch=self.architecture
         )
         logger.info(f"Downloading Python installer from {url} -> {dest}")
+        import urllib.request
+
+        urlretrieve = self._urlretrieve or urllib.request.urlretrieve
         try:
-            urllib.request.urlretrieve(url, dest)
+            urlretrieve(url, dest)
         except Exception as exc:
             if dest.exists():
                 dest.unlink()
@@ -229,6 +250,8 @@ class PythonInstallerProcessManager:
 
     def _run_install(self, installer: Path) -> None:
         """Run the installer silently and raise on failure."""
+        import subprocess
+
         cmd = [str(installer), '/quiet', 'InstallAllUsers=0']
         if self.add_to_path:
             cmd.append('PrependPath=1')
@@ -254,6 +277,8 @@ class PythonInstallerProcessManager:
 
     def _run_uninstall(self, installer: Path) -> None:
         """Run silent uninstallation using the downloaded/provided installer."""
+        import subprocess
+
         cmd = [str(installer), '/quiet', '/uninstall']
         logger.info(f"Running uninstaller: {' '.join(cmd)}")
         try:
@@ -282,6 +307,8 @@ class PythonInstallerProcessManager:
                 f"Installation verification failed: python.exe not found "
                 f"(install_path='{self.install_path}', version='{self.version}')"
             )
+        import subprocess
+
         try:
             result = subprocess.run(
                 [exe, '--version'], capture_output=True, text=True, timeout=10
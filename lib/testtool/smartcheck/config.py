@@ -4,7 +4,27 @@ SmartCheck Configuration Management
 This module provides configuration management and validation for SmartCheck.
 """
 
-from typing import Dict, Any
+from types import MappingProxyType
+from typing import Dict, Any, FrozenSet, Mapping
+
+
+# Default configuration values matching SmartCheck.ini [global] section.
+# Built once at import and exposed read-only; get_default_config() hands
+# callers their own mutable copy.
+_DEFAULT_CONFIG: Mapping[str, Any] = MappingProxyType({
+    'total_cycle': 0,           # 0 = infinite cycles
+    'total_time': 10080,        # Total time in minutes (default: 7 days)
+    'dut_id': '',               # Device Under Test identifier
+    'enable_monitor_smart': True,       # Enable SMART attribute monitoring
+    'close_window_when_failed': False,  # Close console window on failure
+    'stop_when_failed': True,           # Stop execution on failure
+    'smart_config_file': 'config\\SMART.ini',  # SMART config file path
+    'timeout': 60,              # Timeout in minutes (default: 1 hour)
+    'check_interval': 3,        # Status check interval in seconds
+})
+
+# Valid parameter names for configuration
+_VALID_PARAMS: FrozenSet[str] = frozenset(_DEFAULT_CONFIG)
 
 
 class SmartCheckConfig:
@@ -17,21 +37,11 @@ class SmartCheckConfig:
     - Type conversion utilities
     """
     
-    # Default configuration values matching SmartCheck.ini [global] section
-    DEFAULT_CONFIG: Dict[str, Any] = {
-        'total_cycle': 0,           # 0 = infinite cycles
-        'total_time': 10080,        # Total time in minutes (default: 7 days)
-        'dut_id': '',               # Device Under Test identifier
-        'enable_monitor_smart': True,       # Enable SMART attribute monitoring
-        'close_window_when_failed': False,  # Close console window on failure
-        'stop_when_failed': True,           # Stop execution on failure
-        'smart_config_file': 'config\\SMART.ini',  # SMART config file path
-        'timeout': 60,              # Timeout in minutes (default: 1 hour)
-        'check_interval': 3,        # Status check interval in seconds
-    }
+    # Read-only view of the module-level defaults
+    DEFAULT_CONFIG: Mapping[str, Any] = _DEFAULT_CONFIG
     
     # Valid parameter names for configuration
-    VALID_PARAMS = set(DEFAULT_CONFIG.keys())
+    VALID_PARAMS: FrozenSet[str] = _VALID_PARAMS
     
     @staticmethod
     def validate_config(config: Dict[str, Any]) -> bool:
@@ -54,7 +64,7 @@ class SmartCheckConfig:
         """
         for key, value in config.items():
             # Check if parameter name is valid
-            if key not in SmartCheckConfig.VALID_PARAMS:
+            if key not in _VALID_PARAMS:
                 raise ValueError(f"Invalid configuration parameter: {key}")
             
             # Validate specific parameters
@@ -132,4 +142,4 @@ class SmartCheckConfig:
         Returns:
             Dictionary containing default configuration values
         """
-        return SmartCheckConfig.DEFAULT_CONFIG.copy()
+        return dict(_DEFAULT_CONFIG)
@@ -15,7 +15,7 @@ import subprocess
 import time
 import os
 import json
-import configparser
+import re
 import shutil
 import sys
 from pathlib import Path
@@ -46,6 +46,24 @@ _REL_PATH_TESTKIT = os.path.join("bin", "installers", "SmiWinTools", "v20260213B
 # Legacy relative path (pre-chocolatey layout, kept for backward compatibility)
 _LEGACY_REL_BAT = os.path.join(".", "bin", "SmiWinTools", _BAT_NAME)
 
+# SmartCheck.ini and RunCard.ini are flat "[section]" + "key = value" files;
+# these patterns let the controller scan them in one pass without building
+# a ConfigParser each time.
+_SECTION_RE = re.compile(r'^\s*\[([^\]]+)\]\s*$', re.M)
+_KV_RE = re.compile(r'^[ \t]*([A-Za-z_]\w*)[ \t]*[=:][ \t]*(.*?)[ \t\r]*$', re.M)
+
+# Bytes-mode counterparts used by read_runcard_status(), which parses the
+# raw file and decodes only the string fields it returns
+_RUNCARD_STATUS_RE = re.compile(rb'^[ \t]*\[[ \t]*Test Status[ \t]*\][ \t\r]*$', re.M)
+_RUNCARD_HEADER_RE = re.compile(rb'^[ \t]*\[', re.M)
+_RUNCARD_KV_RE = re.compile(rb'^[ \t]*([A-Za-z_]\w*)[ \t]*[=:][ \t]*(.*?)[ \t\r]*$', re.M)
+
+# Read buffer for RunCard.ini polling and JSON config loading
+_READ_BUFFER_SIZE = 64 * 1024
+
+# RunCard err_msg values (lower-cased, stripped) that mean "no error"
+_OK_ERR_MSGS = frozenset({'no error', 'pass', ''})
+
 
 class SmartCheckController(threading.Thread):
     """
@@ -82,6 +100,16 @@ class SmartCheckController(threading.Thread):
         True
     """
     
+    # Fixed slots for the per-run settings and state read in the monitoring
+    # loop. threading.Thread still provides __dict__ for its own attributes.
+    __slots__ = (
+        'bat_path', 'cfg_ini_path', 'output_dir',
+        'total_cycle', 'total_time', 'dut_id',
+        'enable_monitor_smart', 'close_window_when_failed', 'stop_when_failed',
+        'smart_config_file', 'timeout', 'check_interval', 'status',
+        '_process', '_stop_event', '_cleared_event', '_runcard_path',
+    )
+    
     def __init__(
         self,
         bat_path: str = '',
@@ -153,6 +181,7 @@ class SmartCheckController(threading.Thread):
         # Internal state management
         self._process: Optional[subprocess.Popen] = None
         self._stop_event = threading.Event()
+        self._cleared_event = threading.Event()  # set once clear_output_dir() has run
         self._runcard_path: Optional[Path] = None
         
         # Apply any additional configuration from kwargs
@@ -208,14 +237,21 @@ class SmartCheckController(threading.Thread):
             SmartCheckConfigError: If JSON file is invalid or missing
         """
         try:
-            with open(json_path, 'r', encoding='utf-8') as f:
+            # json.load accepts bytes and detects UTF-8 itself
+            with open(json_path, 'rb', buffering=_READ_BUFFER_SIZE) as f:
                 data = json.load(f)
             
             # Extract smartcheck configuration section
-            if 'smartcheck' not in data:
+            config = data.get('smartcheck')
+            if config is None:
                 raise SmartCheckConfigError(f"'smartcheck' section not found in {json_path}")
             
-            config = data['smartcheck']
+            # Report every unknown key at once before per-value validation
+            unknown = config.keys() - SmartCheckConfig.VALID_PARAMS
+            if unknown:
+                raise SmartCheckConfigError(
+                    f"Invalid configuration parameter(s) in {json_path}: {', '.join(sorted(unknown))}"
+                )
             
             # Try to get testlog path from path_manager (for packaged environment)
             try:
@@ -400,8 +436,8 @@ class SmartCheckController(threading.Thread):
         """
         Update a specific key in SmartCheck.ini.
         
-        This method reads the INI file, updates the specified key,
-        and writes it back to disk.
+        This method updates the key in place with a single line scan
+        (see _write_ini_section) and writes the file back in one call.
         
         Args:
             section: INI section name (e.g., 'global')
@@ -419,19 +455,7 @@ class SmartCheckController(threading.Thread):
             True
         """
         try:
-            config = configparser.ConfigParser()
-            config.read(self.cfg_ini_path, encoding='utf-8')
-            
-            # Create section if it doesn't exist
-            if not config.has_section(section):
-                config.add_section(section)
-            
-            # Update the key
-            config.set(section, key, str(value))
-            
-            # Write back to file
-            with open(self.cfg_ini_path, 'w', encoding='utf-8') as f:
-                config.write(f)
+            self._write_ini_section(section, {key: value})
             
             logger.debug(f"Updated SmartCheck.ini: [{section}] {key}={value}")
             return True
@@ -440,6 +464,55 @@ class SmartCheckController(threading.Thread):
             logger.error(f"Failed to update SmartCheck.ini: {e}")
             raise SmartCheckConfigError(f"Failed to update INI file: {e}")
     
+    def _write_ini_section(self, section: str, values: Dict[str, Any]) -> None:
+        """
+        Set several keys of one SmartCheck.ini section in a single pass.
+        
+        Existing keys are replaced in place (case-insensitive match),
+        missing keys are inserted at the end of the section, and the
+        section is appended if absent. The file is read once and written
+        once; lines that are not updated, including comments, are kept.
+        
+        Args:
+            section: INI section name (e.g., 'global')
+            values: Mapping of key name to value (converted with str())
+        """
+        ini_path = Path(self.cfg_ini_path)
+        lines = (ini_path.read_text(encoding='utf-8').splitlines(keepends=True)
+                 if ini_path.exists() else [])
+        pending = {key.lower(): f"{key} = {value}\n" for key, value in values.items()}
+        
+        # Find the section, then its keys up to the next header
+        section_found = False
+        insert_at = len(lines)
+        for i, line in enumerate(lines):
+            header = _SECTION_RE.match(line)
+            if header:
+                if section_found:
+                    break
+                section_found = header.group(1).strip() == section
+                insert_at = i + 1
+            elif section_found:
+                kv = _KV_RE.match(line)
+                if kv and kv.group(1).lower() in pending:
+                    lines[i] = pending.pop(kv.group(1).lower())
+                if line.strip():
+                    insert_at = i + 1
+        
+        if not section_found:
+            # Create section if it doesn't exist
+            if lines and not lines[-1].endswith('\n'):
+                lines[-1] += '\n'
+            if lines:
+                lines.append('\n')
+            lines.append(f"[{section}]\n")
+            insert_at = len(lines)
+        elif pending and not lines[insert_at - 1].endswith('\n'):
+            lines[insert_at - 1] += '\n'
+        lines[insert_at:insert_at] = pending.values()
+        
+        ini_path.write_text(''.join(lines), encoding='utf-8')
+    
     def write_all_config_to_ini(self) -> bool:
         """
         Write all current configuration to SmartCheck.ini.
@@ -455,33 +528,24 @@ class SmartCheckController(threading.Thread):
             SmartCheckConfigError: If INI file cannot be written
         """
         try:
-            config = configparser.ConfigParser()
-            config.read(self.cfg_ini_path, encoding='utf-8')
-            
-            # Ensure [global] section exists
-            if not config.has_section('global'):
-                config.add_section('global')
-            
             # Convert output_dir to absolute path before writing to INI
             # SmartCheck.bat runs in its own directory, so relative paths won't work
             abs_output_dir = os.path.abspath(self.output_dir)
             
-            # Write all SmartCheck.ini parameters
-            config.set('global', 'output_dir', abs_output_dir)
-            config.set('global', 'total_cycle', str(self.total_cycle))
-            config.set('global', 'total_time', str(self.total_time))
-            config.set('global', 'dut_id', str(self.dut_id))
-            config.set('global', 'enable_monitor_smart', 
-                      SmartCheckConfig.convert_bool_to_ini_value(self.enable_monitor_smart))
-            config.set('global', 'close_window_when_failed', 
-                      SmartCheckConfig.convert_bool_to_ini_value(self.close_window_when_failed))
-            config.set('global', 'stop_when_failed', 
-                      SmartCheckConfig.convert_bool_to_ini_value(self.stop_when_failed))
-            config.set('global', 'smart_config_file', self.smart_config_file)
-            
-            # Write to file
-            with open(self.cfg_ini_path, 'w', encoding='utf-8') as f:
-                config.write(f)
+            # Write all SmartCheck.ini parameters in a single read/write pass
+            self._write_ini_section('global', {
+                'output_dir': abs_output_dir,
+                'total_cycle': self.total_cycle,
+                'total_time': self.total_time,
+                'dut_id': self.dut_id,
+                'enable_monitor_smart':
+                    SmartCheckConfig.convert_bool_to_ini_value(self.enable_monitor_smart),
+                'close_window_when_failed':
+                    SmartCheckConfig.convert_bool_to_ini_value(self.close_window_when_failed),
+                'stop_when_failed':
+                    SmartCheckConfig.convert_bool_to_ini_value(self.stop_when_failed),
+                'smart_config_file': self.smart_config_file,
+            })
             
             logger.info("All configuration written to SmartCheck.ini")
             return True
@@ -525,6 +589,9 @@ class SmartCheckController(threading.Thread):
             logger.error(f"Refusing to clear dangerous path: {abs_output_dir}")
             raise SmartCheckConfigError(f"Cannot clear dangerous path: {abs_output_dir}")
         
+        # Any cached RunCard.ini belongs to the run being cleared away
+        self._runcard_path = None
+        
         # Clear the configured output directory
         if os.path.exists(abs_output_dir):
             try:
@@ -548,6 +615,9 @@ class SmartCheckController(threading.Thread):
                 logger.info(f"Cleared default log directory: {default_log_dir}")
             except Exception as e:
                 logger.warning(f"Failed to clear default log directory: {e}")
+        
+        # Lets callers (e.g. tests) wait for the clear instead of sleeping
+        self._cleared_event.set()
     
     def _clear_directory_contents(self, directory: str) -> None:
         """
@@ -557,17 +627,19 @@ class SmartCheckController(threading.Thread):
             directory: Absolute path to directory to clear
         """
         try:
-            for item in os.listdir(directory):
-                item_path = os.path.join(directory, item)
-                try:
-                    if os.path.isfile(item_path) or os.path.islink(item_path):
-                        os.unlink(item_path)
-                        logger.debug(f"Deleted file: {item_path}")
-                    elif os.path.isdir(item_path):
-                        shutil.rmtree(item_path)
-                        logger.debug(f"Deleted directory: {item_path}")
-                except Exception as e:
-                    logger.warning(f"Failed to delete {item_path}: {e}")
+            # scandir entries carry the file type, so no extra stat per item
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    item_path = entry.path
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            shutil.rmtree(item_path)
+                            logger.debug(f"Deleted directory: {item_path}")
+                        else:
+                            os.unlink(item_path)
+                            logger.debug(f"Deleted file: {item_path}")
+                    except Exception as e:
+                        logger.warning(f"Failed to delete {item_path}: {e}")
         except Exception as e:
             logger.error(f"Error listing directory {directory}: {e}")
             raise
@@ -798,19 +870,21 @@ class SmartCheckController(threading.Thread):
         Find RunCard.ini in output directory.
         
         SmartCheck.bat creates subdirectories with timestamp format
-        (YYYYMMDDHHMMSS). This method recursively searches for
-        RunCard.ini and returns the path to the most recent one.
+        (YYYYMMDDHHMMSS). This method checks those directories newest
+        first and, if none holds a RunCard.ini, recursively searches
+        output_dir and returns the most recently modified one.
         
         Returns:
             Path to RunCard.ini if found, None otherwise
         
         Note:
-            - Searches output_dir recursively
-            - Returns first match found
-            - Caches result in self._runcard_path for efficiency
+            - Timestamp directories are checked by name, without stat-ing every file
+            - Falls back to a recursive search of output_dir
+            - Caches result in self._runcard_path for efficiency; the cache
+              is reused while the file exists and reset by clear_output_dir()
         """
-        # Return cached path if already found
-        if self._runcard_path and self._runcard_path.exists():
+        # Return cached path if already found; one stat instead of a rescan
+        if self._runcard_path is not None and self._runcard_path.is_file():
             return self._runcard_path
         
         if not os.path.exists(self.output_dir):
@@ -818,8 +892,23 @@ class SmartCheckController(threading.Thread):
             return None
         
         try:
-            # Search recursively for RunCard.ini
-            # SmartCheck.bat typically creates: output_dir/YYYYMMDDHHMMSS/RunCard.ini
+            # Fast path: SmartCheck.bat typically creates
+            # output_dir/YYYYMMDDHHMMSS/RunCard.ini, so the newest run is the
+            # lexicographically largest timestamp directory.
+            with os.scandir(self.output_dir) as entries:
+                stamp_dirs = sorted(
+                    (e.name for e in entries
+                     if e.name.isdigit() and e.is_dir(follow_symlinks=False)),
+                    reverse=True,
+                )
+            for name in stamp_dirs:
+                candidate = Path(self.output_dir, name, 'RunCard.ini')
+                if candidate.is_file():
+                    logger.debug(f"Found RunCard.ini at: {candidate}")
+                    self._runcard_path = candidate
+                    return self._runcard_path
+            
+            # Fall back to a recursive search for non-standard layouts
             found_paths = []
             for root, dirs, files in os.walk(self.output_dir):
                 if 'RunCard.ini' in files:
@@ -873,28 +962,40 @@ class SmartCheckController(threading.Thread):
             'PASSED'
         """
         try:
-            config = configparser.ConfigParser()
-            config.read(runcard_path, encoding='utf-8')
+            # One large buffered read per poll; the file grows while
+            # SmartCheck runs and the default buffer is st_blksize (often 4 KiB)
+            with open(runcard_path, 'rb', buffering=_READ_BUFFER_SIZE) as f:
+                data = f.read()
             
-            if not config.has_section('Test Status'):
+            # Slice out the [Test Status] body (up to the next header or EOF)
+            start = _RUNCARD_STATUS_RE.search(data)
+            if start is None:
                 raise SmartCheckRunCardError(f"[Test Status] section not found in {runcard_path}")
+            end = _RUNCARD_HEADER_RE.search(data, start.end())
+            section = data[start.end():end.start() if end else len(data)]
+            
+            # Keys are case-insensitive, as with ConfigParser. Values stay
+            # bytes; only the string fields returned below are decoded.
+            fields = {key.lower(): value for key, value in _RUNCARD_KV_RE.findall(section)}
             
             # Extract all status fields
             status_dict = {
-                'version': config.get('Test Status', 'version', fallback=''),
-                'test_cases': config.get('Test Status', 'test_cases', fallback=''),
-                'cycle': config.getint('Test Status', 'cycle', fallback=0),
-                'loop': config.getint('Test Status', 'loop', fallback=0),
-                'start_time': config.get('Test Status', 'start_time', fallback=''),
-                'elapsed_time': config.get('Test Status', 'elapsed_time', fallback=''),
-                'test_result': config.get('Test Status', 'test_result', fallback='ONGOING'),
-                'err_msg': config.get('Test Status', 'err_msg', fallback='No Error'),
+                'version': fields.get(b'version', b'').decode('utf-8'),
+                'test_cases': fields.get(b'test_cases', b'').decode('utf-8'),
+                'cycle': int(fields.get(b'cycle', 0)),
+                'loop': int(fields.get(b'loop', 0)),
+                'start_time': fields.get(b'start_time', b'').decode('utf-8'),
+                'elapsed_time': fields.get(b'elapsed_time', b'').decode('utf-8'),
+                'test_result': fields.get(b'test_result', b'ONGOING').decode('utf-8'),
+                'err_msg': fields.get(b'err_msg', b'No Error').decode('utf-8'),
             }
             
             logger.debug(f"RunCard status: {status_dict['test_result']}, cycle: {status_dict['cycle']}, err_msg: {status_dict['err_msg']}")
             return status_dict
             
-        except configparser.Error as e:
+        except SmartCheckRunCardError:
+            raise
+        except ValueError as e:
             raise SmartCheckRunCardError(f"Failed to parse RunCard.ini: {e}")
         except Exception as e:
             raise SmartCheckRunCardError(f"Error reading RunCard.ini: {e}")
@@ -930,7 +1031,7 @@ class SmartCheckController(threading.Thread):
         err_msg = status_dict.get('err_msg', '').lower().strip()
         
         # "no error" or "pass" indicates success
-        if err_msg in ['no error', 'pass', '']:
+        if err_msg in _OK_ERR_MSGS:
             return True
         
         # Any other error message indicates failure
@@ -967,7 +1068,7 @@ class SmartCheckController(threading.Thread):
             - Handles timeout gracefully
             - Ensures process cleanup even on exceptions
         """
-        start_time = time.time()
+        start_time = time.monotonic()
         logger.info("SmartCheckController thread started")
         
         # Convert timeout from minutes to seconds for internal use
@@ -998,12 +1099,12 @@ class SmartCheckController(threading.Thread):
             logger.info("Phase 2: Monitoring")
             
             # Track when we started SmartCheck.bat for RunCard.ini timeout
-            smartcheck_start_time = time.time()
+            smartcheck_start_time = time.monotonic()
             runcard_timeout = 300  # 5 minutes (300 seconds) to find RunCard.ini
             
             while not self._stop_event.is_set():
                 # Check timeout
-                elapsed = time.time() - start_time
+                elapsed = time.monotonic() - start_time
                 if elapsed > timeout_seconds:
                     logger.error(f"Timeout reached ({self.timeout} minutes / {timeout_seconds}s), stopping SmartCheck")
                     self.status = False
@@ -1013,7 +1114,7 @@ class SmartCheckController(threading.Thread):
                 runcard_path = self.find_runcard_ini()
                 if not runcard_path:
                     # RunCard.ini not yet created, wait and retry
-                    elapsed_since_start = time.time() - smartcheck_start_time
+                    elapsed_since_start = time.monotonic() - smartcheck_start_time
                     logger.debug(f"RunCard.ini not found yet, waiting... ({elapsed_since_start:.1f}s since start)")
                     
                     # Check if we've exceeded the 5-minute timeout for finding RunCard.ini
@@ -1078,7 +1179,7 @@ class SmartCheckController(threading.Thread):
             # Always stop the process
             self.stop_smartcheck_bat()
             
-            elapsed_total = time.time() - start_time
+            elapsed_total = time.monotonic() - start_time
             logger.info(f"SmartCheckController thread finished (Status: {self.status}, Duration: {elapsed_total:.1f}s)")
     
     def stop(self) -> None:
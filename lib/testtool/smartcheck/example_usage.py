@@ -87,9 +87,9 @@ def example_with_monitoring():
     controller.start()
     
     # Monitor while running
-    start_time = time.time()
+    start_time = time.monotonic()
     while controller.is_alive():
-        elapsed = time.time() - start_time
+        elapsed = time.monotonic() - start_time
         print(f"  Running... {elapsed:.1f}s elapsed (Status: {controller.status})")
         time.sleep(5)  # Print status every 5 seconds
         
@@ -4,9 +4,15 @@ Pytest configuration and fixtures for PHM unit tests.
 
 import os
 import tempfile
+from unittest.mock import MagicMock
+
 import pytest
 
 
+# Playwright mock tree shared across tests; built once and reset per test.
+_PW_TEMPLATE = None
+
+
 @pytest.fixture
 def temp_dir():
     """Create a temporary directory for tests."""
@@ -20,6 +26,26 @@ def temp_log_path(temp_dir):
     return os.path.join(temp_dir, 'phm_test.log')
 
 
+@pytest.fixture
+def pw_mocks():
+    """
+    (playwright, browser, context, page) mock chain for PHMUIMonitor tests.
+
+    The tree is built once per session and ``reset_mock()`` is called before
+    each test, which clears call records without re-creating child mocks.
+    """
+    global _PW_TEMPLATE
+    if _PW_TEMPLATE is None:
+        pw, browser, ctx, page = MagicMock(), MagicMock(), MagicMock(), MagicMock()
+        pw.chromium.launch.return_value = browser
+        browser.new_context.return_value = ctx
+        ctx.new_page.return_value = page
+        _PW_TEMPLATE = (pw, browser, ctx, page)
+    for m in _PW_TEMPLATE:
+        m.reset_mock()
+    return _PW_TEMPLATE
+
+
 @pytest.fixture
 def sample_config():
     """
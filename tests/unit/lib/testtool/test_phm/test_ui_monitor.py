@@ -119,19 +119,9 @@ class TestPHMUIMonitorWaitForReady:
 class TestPHMUIMonitorOpenCloseBrowser:
     """Tests for open_browser() and close_browser()."""
 
-    def _mock_playwright(self):
-        mock_pw = MagicMock()
-        mock_browser = MagicMock()
-        mock_context = MagicMock()
-        mock_page = MagicMock()
-        mock_pw.chromium.launch.return_value = mock_browser
-        mock_browser.new_context.return_value = mock_context
-        mock_context.new_page.return_value = mock_page
-        return mock_pw, mock_browser, mock_context, mock_page
-
-    def test_open_browser_sets_connected(self):
+    def test_open_browser_sets_connected(self, pw_mocks):
         m = _make_monitor()
-        mock_pw, mock_browser, mock_context, mock_page = self._mock_playwright()
+        mock_pw, mock_browser, mock_context, mock_page = pw_mocks
         mock_sync_pw = MagicMock()
         mock_sync_pw.return_value.__enter__ = Mock(return_value=mock_pw)
         mock_sync_pw.return_value.__exit__ = Mock(return_value=False)
@@ -142,9 +132,9 @@ class TestPHMUIMonitorOpenCloseBrowser:
             assert m.is_connected
             assert m.page is not None
 
-    def test_open_browser_uses_headless_param(self):
+    def test_open_browser_uses_headless_param(self, pw_mocks):
         m = _make_monitor(headless=False)
-        mock_pw, mock_browser, mock_context, mock_page = self._mock_playwright()
+        mock_pw, mock_browser, mock_context, mock_page = pw_mocks
         mock_sync_pw = MagicMock()
         mock_sync_pw.return_value.start.return_value = mock_pw
 
@@ -6,6 +6,23 @@ import pytest
 import tempfile
 import os
 
+try:
+    from pytest_socket import disable_socket
+except ImportError:  # pytest-socket not installed: run without the guard
+    disable_socket = None
+
+
+def pytest_runtest_setup(item):
+    """
+    Block real network access for every test in this package.
+
+    All urllib calls are mocked; if a mock regresses, the test fails fast
+    with SocketBlockedError instead of waiting on DNS/TCP timeouts.
+    pytest-socket restores sockets in its own teardown hook.
+    """
+    if disable_socket is not None:
+        disable_socket()
+
 
 @pytest.fixture
 def temp_dir():
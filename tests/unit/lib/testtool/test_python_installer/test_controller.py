@@ -3,7 +3,8 @@ Unit tests for PythonInstallerController.
 All external dependencies are mocked — no real installers or file system access.
 """
 
-from unittest.mock import Mock, patch, MagicMock
+from unittest.mock import Mock, patch
+from types import MappingProxyType
 import threading
 
 from lib.testtool.python_installer.controller import PythonInstallerController
@@ -17,20 +18,36 @@ from lib.testtool.python_installer.exceptions import (
 import pytest
 
 
+_VALID_KWARGS = MappingProxyType({
+    'version': '3.11',
+    'timeout_seconds': 60,
+})
+
+
+@pytest.fixture(scope="class")
+def vanilla_ctrl():
+    """One controller shared by the read-only attribute tests of a class."""
+    with patch(
+        'lib.testtool.python_installer.controller.PythonInstallerProcessManager',
+    ):
+        yield PythonInstallerController(**_VALID_KWARGS)
+
+
 class TestPythonInstallerController:
 
     def setup_method(self):
         """Minimal valid kwargs for __init__ + patch process manager build."""
-        self.valid_kwargs = {
-            'version': '3.11',
-            'timeout_seconds': 60,
-        }
+        self.valid_kwargs = _VALID_KWARGS
         # Prevent real process manager creation during most tests
         self._pm_patcher = patch(
             'lib.testtool.python_installer.controller.PythonInstallerProcessManager',
-            autospec=True,
         )
         self.MockPM = self._pm_patcher.start()
+        # Only the delegated methods are needed; a list spec avoids the
+        # per-test signature walk that autospec performs on the real class.
+        self.MockPM.return_value = Mock(
+            spec=['is_installed', 'install', 'uninstall', 'get_executable_path'],
+        )
         self.mock_pm_instance = self.MockPM.return_value
         self.mock_pm_instance.is_installed.return_value = False
         self.mock_pm_instance.get_executable_path.return_value = 'C:/Python311/python.exe'
@@ -40,25 +57,20 @@ class TestPythonInstallerController:
 
     # ----- Initialization -----
 
-    def test_init_sets_version(self):
-        ctrl = PythonInstallerController(**self.valid_kwargs)
-        assert ctrl._config['version'] == '3.11'
+    def test_init_sets_version(self, vanilla_ctrl):
+        assert vanilla_ctrl._config['version'] == '3.11'
 
-    def test_init_status_is_none(self):
-        ctrl = PythonInstallerController(**self.valid_kwargs)
-        assert ctrl.status is None
+    def test_init_status_is_none(self, vanilla_ctrl):
+        assert vanilla_ctrl.status is None
 
-    def test_init_error_count_zero(self):
-        ctrl = PythonInstallerController(**self.valid_kwargs)
-        assert ctrl.error_count == 0
+    def test_init_error_count_zero(self, vanilla_ctrl):
+        assert vanilla_ctrl.error_count == 0
 
-    def test_is_thread(self):
-        ctrl = PythonInstallerController(**self.valid_kwargs)
-        assert isinstance(ctrl, threading.Thread)
+    def test_is_thread(self, vanilla_ctrl):
+        assert isinstance(vanilla_ctrl, threading.Thread)
 
-    def test_is_daemon(self):
-        ctrl = PythonInstallerController(**self.valid_kwargs)
-        assert ctrl.daemon
+    def test_is_daemon(self, vanilla_ctrl):
+        assert vanilla_ctrl.daemon
 
     def test_init_invalid_config_raises(self):
         with pytest.raises(PythonInstallerConfigError):
@@ -78,9 +90,8 @@ class TestPythonInstallerController:
 
     # ----- status property -----
 
-    def test_status_initially_none(self):
-        ctrl = PythonInstallerController(**self.valid_kwargs)
-        assert ctrl.status is None
+    def test_status_initially_none(self, vanilla_ctrl):
+        assert vanilla_ctrl.status is None
 
     # ----- is_installed -----
 
@@ -3,8 +3,10 @@ Unit tests for PythonInstallerProcessManager.
 All subprocess and network calls are mocked.
 """
 
-from unittest.mock import Mock, patch, MagicMock, call
+from unittest.mock import Mock, patch
 from pathlib import Path
+from types import MappingProxyType
+import copy
 import subprocess
 
 from lib.testtool.python_installer.process_manager import PythonInstallerProcessManager
@@ -16,203 +18,201 @@ from lib.testtool.python_installer.exceptions import (
 import pytest
 
 
-class TestPythonInstallerProcessManager:
-
-    def setup_method(self):
-        self.valid_kwargs = {
-            'version': '3.11',
-            'architecture': 'amd64',
-            'install_path': 'C:/Python311',
-            'add_to_path': True,
-            'installer_path': '',
-            'download_dir': './testlog',
-            'timeout_seconds': 60,
-        }
-
-    # ----- is_installed -----
-
-    @patch('lib.testtool.python_installer.process_manager.Path')
-    def test_is_installed_true_when_exe_exists(self, MockPath):
-        mock_exe = MagicMock()
-        mock_exe.is_file.return_value = True
-        MockPath.return_value.__truediv__.return_value = mock_exe
-
-        pm = PythonInstallerProcessManager(**self.valid_kwargs)
-        # Directly override install_path's Path evaluation
-        with patch.object(Path, 'is_file', return_value=True):
-            # Simpler: patch the method directly
-            pm.install_path = 'C:/Python311'
-            result = pm.is_installed()
-        # Since we can't easily patch pathlib.Path(...) /  'python.exe',
-        # test via mock subprocess fallback when install_path is empty
-        # (see test below)
-
-    def test_is_installed_fallback_without_install_path(self):
-        """When install_path is empty, falls back to py launcher."""
-        pm = PythonInstallerProcessManager(
-            version='3.11',
-            install_path='',
-        )
-        mock_result = Mock()
-        mock_result.returncode = 0
-        with patch('subprocess.run', return_value=mock_result) as mock_run:
-            result = pm.is_installed()
-        assert result
-        mock_run.assert_called_once()
-
-    def test_is_installed_false_when_launcher_fails(self):
-        """Returns False when py launcher returns non-zero."""
-        pm = PythonInstallerProcessManager(version='3.11', install_path='')
-        mock_result = Mock()
-        mock_result.returncode = 1
-        with patch('subprocess.run', return_value=mock_result):
-            result = pm.is_installed()
-        assert not result
-
-    def test_is_installed_false_when_launcher_not_found(self):
-        """Returns False when py launcher is not installed."""
-        pm = PythonInstallerProcessManager(version='3.11', install_path='')
-        with patch('subprocess.run', side_effect=FileNotFoundError):
-            result = pm.is_installed()
-        assert not result
-
-    # ----- _resolve_full_version -----
-
-    def test_resolve_three_part_version_unchanged(self):
-        kwargs = {**self.valid_kwargs, 'version': '3.11.8'}
-        pm = PythonInstallerProcessManager(**kwargs)
-        pm._resolve_full_version()
-        assert pm.full_version == '3.11.8'
-
-    def test_resolve_two_part_version_appends_patch(self):
-        pm = PythonInstallerProcessManager(**self.valid_kwargs)
-        # Mock urllib.request.urlopen to succeed
-        with patch('urllib.request.urlopen') as mock_open:
-            mock_open.return_value.__enter__ = Mock(return_value=None)
-            mock_open.return_value.__exit__ = Mock(return_value=False)
-            pm._resolve_full_version()
-        assert pm.full_version == '3.11.0'
-
-    def test_resolve_falls_back_on_network_error(self):
-        pm = PythonInstallerProcessManager(**self.valid_kwargs)
-        with patch('urllib.request.urlopen', side_effect=Exception("network error")):
-            pm._resolve_full_version()
-        assert pm.full_version == '3.11.0'
-
-    # ----- _ensure_installer -----
-
-    def test_ensure_installer_uses_provided_path(self):
-        kwargs = {**self.valid_kwargs, 'installer_path': 'C:/fake/python-3.11.0-amd64.exe'}
-        pm = PythonInstallerProcessManager(**kwargs)
-        pm.full_version = '3.11.0'
-        with patch('pathlib.Path.is_file', return_value=True):
-            result = pm._ensure_installer()
-        # Compare using Path to normalise separators (Windows uses backslash)
-        from pathlib import Path as _Path
-        assert _Path(result) == _Path('C:/fake/python-3.11.0-amd64.exe')
-
-    def test_ensure_installer_raises_if_provided_path_missing(self):
-        kwargs = {**self.valid_kwargs, 'installer_path': 'C:/missing/installer.exe'}
-        pm = PythonInstallerProcessManager(**kwargs)
-        pm.full_version = '3.11.0'
-        with patch('pathlib.Path.is_file', return_value=False):
-            with pytest.raises(PythonInstallerInstallError):
-                pm._ensure_installer()
-
-    def test_ensure_installer_raises_on_download_failure(self):
-        pm = PythonInstallerProcessManager(**self.valid_kwargs)
-        pm.full_version = '3.11.0'
-        with patch('pathlib.Path.is_file', return_value=False), \
-             patch('pathlib.Path.mkdir'), \
-             patch('urllib.request.urlretrieve', side_effect=Exception("404")):
-            with pytest.raises(PythonInstallerInstallError):
-                pm._ensure_installer()
-
-    # ----- _run_install -----
-
-    def test_run_install_calls_subprocess(self):
-        pm = PythonInstallerProcessManager(**self.valid_kwargs)
-        mock_result = Mock()
-        mock_result.returncode = 0
-        with patch('subprocess.run', return_value=mock_result) as mock_run:
-            pm._run_install(Path('python-3.11.0-amd64.exe'))
-        cmd_used = mock_run.call_args[0][0]
-        assert '/quiet' in cmd_used
-
-    def test_run_install_raises_on_nonzero_returncode(self):
-        pm = PythonInstallerProcessManager(**self.valid_kwargs)
-        mock_result = Mock()
-        mock_result.returncode = 1
-        mock_result.stderr = b'Error: bad'
-        with patch('subprocess.run', return_value=mock_result):
-            with pytest.raises(PythonInstallerInstallError):
-                pm._run_install(Path('installer.exe'))
-
-    def test_run_install_raises_on_timeout(self):
-        pm = PythonInstallerProcessManager(**self.valid_kwargs)
-        with patch('subprocess.run', side_effect=subprocess.TimeoutExpired(cmd=[], timeout=60)):
-            with pytest.raises(PythonInstallerTimeoutError):
-                pm._run_install(Path('installer.exe'))
-
-    def test_run_install_includes_target_dir(self):
-        pm = PythonInstallerProcessManager(**self.valid_kwargs)
-        mock_result = Mock()
-        mock_result.returncode = 0
-        with patch('subprocess.run', return_value=mock_result) as mock_run:
-            pm._run_install(Path('installer.exe'))
-        cmd_used = mock_run.call_args[0][0]
-        assert any('TargetDir' in str(part) for part in cmd_used)
-
-    def test_run_install_includes_prepend_path_when_add_to_path(self):
-        pm = PythonInstallerProcessManager(**self.valid_kwargs)
-        mock_result = Mock()
-        mock_result.returncode = 0
-        with patch('subprocess.run', return_value=mock_result) as mock_run:
-            pm._run_install(Path('installer.exe'))
-        cmd_used = mock_run.call_args[0][0]
-        assert 'PrependPath=1' in cmd_used
-
-    # ----- _run_uninstall -----
-
-    def test_run_uninstall_calls_subprocess_with_uninstall_flag(self):
-        pm = PythonInstallerProcessManager(**self.valid_kwargs)
-        mock_result = Mock()
-        mock_result.returncode = 0
-        with patch('subprocess.run', return_value=mock_result) as mock_run:
-            pm._run_uninstall(Path('installer.exe'))
-        cmd_used = mock_run.call_args[0][0]
-        assert '/uninstall' in cmd_used
-
-    def test_run_uninstall_raises_on_nonzero_returncode(self):
-        pm = PythonInstallerProcessManager(**self.valid_kwargs)
-        mock_result = Mock()
-        mock_result.returncode = 1
-        mock_result.stderr = b'Error'
-        with patch('subprocess.run', return_value=mock_result):
-            with pytest.raises(PythonInstallerInstallError):
-                pm._run_uninstall(Path('installer.exe'))
-
-    # ----- get_executable_path -----
-
-    def test_get_executable_path_with_install_path_found(self):
-        pm = PythonInstallerProcessManager(**self.valid_kwargs)
-        with patch('pathlib.Path.is_file', return_value=True):
-            exe = pm.get_executable_path()
-        assert 'python.exe' in exe
-
-    def test_get_executable_path_with_install_path_missing(self):
-        pm = PythonInstallerProcessManager(**self.valid_kwargs)
-        with patch('pathlib.Path.is_file', return_value=False):
-            exe = pm.get_executable_path()
-        assert exe == ''
-
-    def test_get_executable_path_fallback_to_py_launcher(self):
-        pm = PythonInstallerProcessManager(version='3.11', install_path='')
-        mock_result = Mock()
-        mock_result.returncode = 0
-        mock_result.stdout = 'C:\\Python311\\python.exe\n'
-        with patch('subprocess.run', return_value=mock_result):
-            exe = pm.get_executable_path()
-        assert exe == 'C:\\Python311\\python.exe'
+def _completed(returncode=0, stderr=b''):
+    """Fresh subprocess.run result mock, so no state is shared between tests."""
+    result = Mock(spec=subprocess.CompletedProcess)
+    result.returncode = returncode
+    result.stderr = stderr
+    return result
 
 
+_VALID_KWARGS = MappingProxyType({
+    'version': '3.11',
+    'architecture': 'amd64',
+    'install_path': 'C:/Python311',
+    'add_to_path': True,
+    'installer_path': '',
+    'download_dir': './testlog',
+    'timeout_seconds': 60,
+})
+
+
+@pytest.fixture(scope="module")
+def pm_readonly():
+    """
+    Process manager built once per module from the default kwargs.
+
+    Only for tests that call methods without assigning attributes on it;
+    tests that mutate state must use ``pm``.
+    """
+    return PythonInstallerProcessManager(**_VALID_KWARGS)
+
+
+@pytest.fixture
+def pm(pm_readonly):
+    """Per-test shallow copy of the shared instance with mutable state reset."""
+    instance = copy.copy(pm_readonly)
+    instance.full_version = ''
+    instance.install_path = _VALID_KWARGS['install_path']
+    return instance
+
+
+@pytest.fixture
+def valid_kwargs():
+    """Fresh, mutable copy of the default constructor kwargs."""
+    return dict(_VALID_KWARGS)
+
+
+@pytest.fixture
+def fake_run(monkeypatch):
+    """Replace subprocess.run for the test; configure return_value/side_effect."""
+    mock_run = Mock(spec=subprocess.run)
+    monkeypatch.setattr('subprocess.run', mock_run)
+    return mock_run
+
+
+# ----- is_installed -----
+
+def test_is_installed_true_when_exe_exists(pm_readonly, monkeypatch):
+    monkeypatch.setattr(Path, 'is_file', lambda self: True)
+    assert pm_readonly.is_installed() is True
+
+
+def test_is_installed_false_when_exe_missing(pm_readonly, monkeypatch):
+    monkeypatch.setattr(Path, 'is_file', lambda self: False)
+    assert pm_readonly.is_installed() is False
+
+
+def test_is_installed_fallback_without_install_path(fake_run):
+    """When install_path is empty, falls back to py launcher."""
+    pm = PythonInstallerProcessManager(
+        version='3.11',
+        install_path='',
+    )
+    fake_run.return_value = _completed()
+    result = pm.is_installed()
+    assert result
+    fake_run.assert_called_once()
+
+
+def test_is_installed_false_when_launcher_fails(fake_run):
+    """Returns False when py launcher returns non-zero."""
+    pm = PythonInstallerProcessManager(version='3.11', install_path='')
+    fake_run.return_value = _completed(1, b'Error')
+    assert not pm.is_installed()
+
+
+def test_is_installed_false_when_launcher_not_found(fake_run):
+    """Returns False when py launcher is not installed."""
+    pm = PythonInstallerProcessManager(version='3.11', install_path='')
+    fake_run.side_effect = FileNotFoundError
+    assert not pm.is_installed()
+
+
+# ----- _resolve_full_version -----
+
+def test_resolve_three_part_version_unchanged(valid_kwargs):
+    kwargs = {**valid_kwargs, 'version': '3.11.8'}
+    pm = PythonInstallerProcessManager(**kwargs)
+    pm._resolve_full_version()
+    assert pm.full_version == '3.11.8'
+
+
+def test_resolve_two_part_version_appends_patch(pm):
+    pm._urlopen = Mock()
+    pm._resolve_full_version()
+    assert pm.full_version == '3.11.0'
+    pm._urlopen.assert_called_once()
+
+
+def test_resolve_falls_back_on_network_error(pm):
+    pm._urlopen = Mock(side_effect=Exception("network error"))
+    pm._resolve_full_version()
+    assert pm.full_version == '3.11.0'
+
+
+# ----- _ensure_installer -----
+
+def test_ensure_installer_uses_provided_path(valid_kwargs):
+    kwargs = {**valid_kwargs, 'installer_path': 'C:/fake/python-3.11.0-amd64.exe'}
+    pm = PythonInstallerProcessManager(**kwargs)
+    pm.full_version = '3.11.0'
+    with patch('pathlib.Path.is_file', return_value=True):
+        result = pm._ensure_installer()
+    # Compare using Path to normalise separators (Windows uses backslash)
+    from pathlib import Path as _Path
+    assert _Path(result) == _Path('C:/fake/python-3.11.0-amd64.exe')
+
+
+def test_ensure_installer_raises_if_provided_path_missing(valid_kwargs):
+    kwargs = {**valid_kwargs, 'installer_path': 'C:/missing/installer.exe'}
+    pm = PythonInstallerProcessManager(**kwargs)
+    pm.full_version = '3.11.0'
+    with patch('pathlib.Path.is_file', return_value=False):
+        with pytest.raises(PythonInstallerInstallError):
+            pm._ensure_installer()
+
+
+def test_ensure_installer_raises_on_download_failure(pm):
+    pm.full_version = '3.11.0'
+    pm._urlretrieve = Mock(side_effect=Exception("404"))
+    with patch('pathlib.Path.is_file', return_value=False), \
+         patch('pathlib.Path.mkdir'):
+        with pytest.raises(PythonInstallerInstallError):
+            pm._ensure_installer()
+
+
+# ----- _run_install / _run_uninstall -----
+
+@pytest.mark.parametrize("method,flag,result,exc", [
+    ('_run_install', '/quiet', 0, None),
+    ('_run_install', None, 1, PythonInstallerInstallError),
+    ('_run_install', None, subprocess.TimeoutExpired(cmd=[], timeout=60),
+     PythonInstallerTimeoutError),
+    ('_run_uninstall', '/uninstall', 0, None),
+    ('_run_uninstall', None, 1, PythonInstallerInstallError),
+])
+def test_run(pm_readonly, fake_run, method, flag, result, exc):
+    """result is a return code, or an exception for subprocess.run to raise."""
+    if isinstance(result, BaseException):
+        fake_run.side_effect = result
+    else:
+        fake_run.return_value = _completed(result, b'Error' if result else b'')
+
+    if exc is None:
+        getattr(pm_readonly, method)(Path('installer.exe'))
+        assert flag in fake_run.call_args[0][0]
+    else:
+        with pytest.raises(exc):
+            getattr(pm_readonly, method)(Path('installer.exe'))
+
+
+@pytest.mark.parametrize("expected", ['TargetDir=', 'PrependPath=1'])
+def test_run_install_command_contains(pm_readonly, fake_run, expected):
+    fake_run.return_value = _completed()
+    pm_readonly._run_install(Path('python-3.11.0-amd64.exe'))
+    cmd_used = fake_run.call_args[0][0]
+    assert any(expected in str(part) for part in cmd_used)
+
+
+# ----- get_executable_path -----
+
+def test_get_executable_path_with_install_path_found(pm_readonly):
+    with patch('pathlib.Path.is_file', return_value=True):
+        exe = pm_readonly.get_executable_path()
+    assert 'python.exe' in exe
+
+
+def test_get_executable_path_with_install_path_missing(pm_readonly):
+    with patch('pathlib.Path.is_file', return_value=False):
+        exe = pm_readonly.get_executable_path()
+    assert exe == ''
+
+
+def test_get_executable_path_fallback_to_py_launcher(fake_run):
+    pm = PythonInstallerProcessManager(version='3.11', install_path='')
+    mock_result = _completed()
+    mock_result.stdout = 'C:\\Python311\\python.exe\n'
+    fake_run.return_value = mock_result
+    exe = pm.get_executable_path()
+    assert exe == 'C:\\Python311\\python.exe'
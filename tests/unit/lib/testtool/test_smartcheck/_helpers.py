@@ -0,0 +1,11 @@
+"""
+Helpers shared by the SmartCheck test modules.
+"""
+
+
+def backoff(initial=0.05, cap=2.0):
+    """Yield poll delays starting at initial seconds and doubling up to cap."""
+    delay = initial
+    while True:
+        yield delay
+        delay = min(cap, delay * 2)
@@ -3,25 +3,31 @@ Pytest configuration and fixtures for SmartCheck unit tests
 """
 
 import pytest
-import sys
+import shutil
 from pathlib import Path
 
-# Add project root to Python path
-project_root = Path(__file__).resolve().parents[6]
-if str(project_root) not in sys.path:
-    sys.path.insert(0, str(project_root))
+# Resolve paths once at import; fixtures and pytest_configure reuse them.
+# The project root is importable via ``pythonpath = .`` in pytest.ini.
+_HERE = Path(__file__).resolve()
+_PROJECT_ROOT = _HERE.parents[6]
+_TESTTOOL_DIR = _HERE.parent.parent
+_BIN_DIR = _TESTTOOL_DIR / "bin"
+
+# Placeholder file contents for controller tests, pre-encoded once
+_BAT_BYTES = b"@echo off\necho SmartCheck\n"
+_INI_BYTES = b"[global]\n"
 
 
 @pytest.fixture(scope="session")
 def project_root_path():
     """Return project root directory path"""
-    return Path(__file__).resolve().parents[6]
+    return _PROJECT_ROOT
 
 
 @pytest.fixture(scope="session")
 def testtool_bin_path():
-    """返回測試工具 Bin directory的路徑"""
-    return Path(__file__).resolve().parent.parent / "bin"
+    """Return testtool bin directory path"""
+    return _BIN_DIR
 
 
 @pytest.fixture(scope="session")
@@ -36,6 +42,54 @@ def smart_ini_path(testtool_bin_path):
     return testtool_bin_path / "SmiWinTools" / "config" / "SMART.ini"
 
 
+@pytest.fixture(scope="session")
+def smartcheck_base_dir(tmp_path_factory):
+    """Create placeholder SmartCheck.bat and pristine SmartCheck.ini once per session"""
+    base = tmp_path_factory.mktemp("smartcheck-base")
+    (base / "SmartCheck.bat").write_bytes(_BAT_BYTES)
+    (base / "SmartCheck.ini").write_bytes(_INI_BYTES)
+    return base
+
+
+@pytest.fixture(scope="session")
+def readonly_paths(smartcheck_base_dir):
+    """
+    Session-wide controller paths for tests that never write to them.
+    
+    Tests that modify SmartCheck.ini or create files in output_dir must
+    use ``test_paths`` instead.
+    """
+    output_dir = smartcheck_base_dir / "output"
+    output_dir.mkdir(exist_ok=True)
+    
+    return {
+        'bat_path': str(smartcheck_base_dir / "SmartCheck.bat"),
+        'ini_path': str(smartcheck_base_dir / "SmartCheck.ini"),
+        'output_dir': str(output_dir),
+    }
+
+
+@pytest.fixture
+def test_paths(tmp_path, smartcheck_base_dir):
+    """
+    Per-test paths for the controller.
+    
+    The bat file is shared read-only; SmartCheck.ini is copied into
+    tmp_path because INI tests modify it, and output_dir is per-test.
+    """
+    ini_path = tmp_path / "SmartCheck.ini"
+    output_dir = tmp_path / "output"
+    
+    shutil.copyfile(smartcheck_base_dir / "SmartCheck.ini", ini_path)
+    output_dir.mkdir()
+    
+    return {
+        'bat_path': str(smartcheck_base_dir / "SmartCheck.bat"),
+        'ini_path': str(ini_path),
+        'output_dir': str(output_dir),
+    }
+
+
 @pytest.fixture
 def temp_log_dir(tmp_path):
     """Create independent temporary log directory for each test"""
@@ -56,23 +110,68 @@ def smartcheck_config():
     }
 
 
+def pytest_collection_modifyitems(config, items):
+    """
+    Skip this package's real_bat tests up front when SmartCheck.bat or
+    SmartCheck.ini is absent, and keep them on one xdist worker otherwise.
+    
+    This is the only place their presence is checked: it runs once per
+    session, so real_bat fixtures can assume both files exist and never
+    run at all on machines without the SmiWinTools binaries.
+    
+    Each test already gets its own output_dir, but every run rewrites the
+    shared SmartCheck.ini beside the .bat and clears its log_SmartCheck
+    directory. Under ``-n ... --dist loadgroup`` they therefore share one
+    xdist group and run one after another while the rest of the suite is
+    distributed.
+    """
+    package_dir = _HERE.parent
+    real_bat_items = [
+        item for item in items
+        if item.get_closest_marker('real_bat') and package_dir in item.path.parents
+    ]
+    if not real_bat_items:
+        return
+    
+    smiwintools_dir = _BIN_DIR / "SmiWinTools"
+    missing = [name for name in ("SmartCheck.bat", "SmartCheck.ini")
+               if not (smiwintools_dir / name).is_file()]
+    if missing:
+        extra_marker = pytest.mark.skip(
+            reason=f"{', '.join(missing)} not found in {smiwintools_dir}"
+        )
+    elif config.pluginmanager.hasplugin("xdist"):
+        extra_marker = pytest.mark.xdist_group("smartcheck_real_bat")
+    else:
+        return
+    for item in real_bat_items:
+        item.add_marker(extra_marker)
+
+
 # Display environment info before testing
 def pytest_configure(config):
     """Pytest configuration hook"""
+    if hasattr(config, 'workerinput'):
+        return  # pytest-xdist worker: the controller already printed it
+    if config.getoption('verbose') < 2:
+        return  # pytest.ini addopts always passes -v; show the banner with -vv
     print("\n" + "="*80)
     print("SmartCheck Unit Test - Environment Check")
     print("="*80)
     
-    testtool_dir = Path(__file__).resolve().parent.parent
-    bin_dir = testtool_dir / "bin"
-    smartcheck_bat = bin_dir / "SmiWinTools" / "SmartCheck.bat"
-    smart_ini = bin_dir / "SmiWinTools" / "config" / "SMART.ini"
+    smartcheck_bat = _BIN_DIR / "SmiWinTools" / "SmartCheck.bat"
+    smart_ini = _BIN_DIR / "SmiWinTools" / "config" / "SMART.ini"
+    
+    # Files under a missing bin directory cannot exist; skip their stat calls
+    bin_exists = _BIN_DIR.exists()
+    bat_exists = bin_exists and smartcheck_bat.exists()
+    ini_exists = bin_exists and smart_ini.exists()
     
-    print(f"Testtool directory: {testtool_dir}")
-    print(f"Bin directory: {bin_dir}")
-    print(f"  - Exists: {bin_dir.exists()}")
+    print(f"Testtool directory: {_TESTTOOL_DIR}")
+    print(f"Bin directory: {_BIN_DIR}")
+    print(f"  - Exists: {bin_exists}")
     print(f"SmartCheck.bat: {smartcheck_bat}")
-    print(f"  - Exists: {smartcheck_bat.exists()}")
+    print(f"  - Exists: {bat_exists}")
     print(f"SMART.ini: {smart_ini}")
-    print(f"  - Exists: {smart_ini.exists()}")
+    print(f"  - Exists: {ini_exists}")
     print("="*80 + "\n")
@@ -20,30 +20,177 @@ import os
 import configparser
 import subprocess
 import json
+import shutil
 from pathlib import Path
-from unittest.mock import Mock, patch, MagicMock, call, mock_open
+from unittest.mock import Mock, patch
 
 # Import the module to test
-import sys
-sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent.parent))
-
 from lib.testtool.smartcheck import (
     SmartCheckController,
     SmartCheckConfig,
-    SmartCheckError,
     SmartCheckConfigError,
-    SmartCheckTimeoutError,
     SmartCheckProcessError,
     SmartCheckRunCardError,
 )
 
 
+# JSON config files used by the load_config_from_json tests
+_JSON_CONFIGS = {
+    'valid': {
+        "smartcheck": {
+            "total_time": 30,
+            "dut_id": "5",
+            "timeout": 15,
+            "total_cycle": 10
+        }
+    },
+    'no_section': {"other": {}},
+    'unknown_keys': {"smartcheck": {"total_time": 30, "foo": 1, "bar": 2}},
+}
+
+
+# RunCard.ini contents shared by the RunCard tests.
+_RUNCARD_EMPTY = b"[Test Status]\n"
+_RUNCARD_ONGOING = b"[Test Status]\ntest_result = ONGOING\n"
+_RUNCARDS = {
+    'passed': b"""[Test Status]
+version = SmiWinTools_v20251215C
+test_cases = [1]
+cycle = 5
+loop = 0
+start_time = 2026/2/10 13:00
+elapsed_time = 0h10m
+test_result = PASSED
+err_msg = No Error
+""",
+    'all_fields': b"""[Test Status]
+version = SmiWinTools_v20251215C
+test_cases = [1]
+cycle = 10
+loop = 2
+start_time = 2026/2/10 15:00
+elapsed_time = 1h30m
+test_result = ONGOING
+err_msg = No Error
+""",
+    'crlf': b"[Test Status]\r\ncycle = 7\r\ntest_result = PASSED\r\nerr_msg = No Error\r\n",
+    'missing_section': b"[Other Section]\nkey = value\n",
+    'other_sections': b"""[Header]
+cycle = 99
+[Test Status]
+cycle = 3
+test_result = FAILED
+[Footer]
+err_msg = not this one
+""",
+}
+
+
+@pytest.fixture(scope="module")
+def runcards(tmp_path_factory):
+    """Write each RunCard in _RUNCARDS once; maps name to path. Read-only."""
+    base = tmp_path_factory.mktemp("runcards")
+    paths = {}
+    for name, content in _RUNCARDS.items():
+        paths[name] = base / f"{name}.ini"
+        paths[name].write_bytes(content)
+    return paths
+
+
+@pytest.fixture(scope="module")
+def json_configs(tmp_path_factory):
+    """Serialize and write each config in _JSON_CONFIGS once; maps name to path. Read-only."""
+    base = tmp_path_factory.mktemp("json_configs")
+    paths = {}
+    for name, content in _JSON_CONFIGS.items():
+        paths[name] = base / f"{name}.json"
+        paths[name].write_bytes(json.dumps(content).encode())
+    return paths
+
+
+@pytest.fixture(scope="module")
+def dummy_tree(tmp_path_factory):
+    """
+    Build a small file tree once for the clear_output_dir tests. Read-only.
+
+    Tests copy it into their own output_dir with shutil.copytree.
+    """
+    base = tmp_path_factory.mktemp("dummy_tree")
+    (base / "dummy.txt").write_bytes(b"This should be deleted")
+    (base / "dummy_dir").mkdir()
+    (base / "dummy_dir" / "file.txt").write_bytes(b"test")
+    return base
+
+
+@pytest.fixture(scope="class")
+def controller(readonly_paths):
+    """
+    Controller shared by all tests in a class.
+
+    Only for tests that call methods without changing its settings or
+    state; tests that do must construct their own.
+    """
+    return SmartCheckController(
+        bat_path=readonly_paths['bat_path'],
+        cfg_ini_path=readonly_paths['ini_path'],
+        output_dir=readonly_paths['output_dir']
+    )
+
+
+@pytest.fixture
+def fresh_controller(test_paths):
+    """Controller on per-test paths, for tests that change its state or files."""
+    return SmartCheckController(
+        bat_path=test_paths['bat_path'],
+        cfg_ini_path=test_paths['ini_path'],
+        output_dir=test_paths['output_dir']
+    )
+
+
+def _read_ini(path):
+    """Parse an INI file once and return {section: {key: value}}."""
+    config = configparser.ConfigParser()
+    config.read(path)
+    return {section: dict(config[section]) for section in config.sections()}
+
+
+# The real class, captured before any test patches subprocess.Popen
+_POPEN = subprocess.Popen
+
+
+def _make_proc(poll_rv=None, pid=12345, returncode=None):
+    """Build a spec'd Popen mock whose poll() returns poll_rv."""
+    proc = Mock(spec=_POPEN)
+    proc.poll.return_value = poll_rv
+    proc.pid = pid
+    proc.returncode = returncode
+    return proc
+
+
+def _wait_until(predicate, timeout, interval=0.05, max_interval=1.0):
+    """
+    Poll predicate until it is true or timeout seconds pass; return whether it became true.
+
+    The delay between polls starts at interval and doubles up to max_interval,
+    so quick events are seen quickly without spinning on slow ones.
+    """
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return False
+        time.sleep(min(interval, remaining))
+        interval = min(max_interval, interval * 2)
+    return True
+
+
 class TestSmartCheckConfig:
     """Test SmartCheckConfig class."""
     
     def test_default_config(self):
         """Test default configuration values."""
-        config = SmartCheckConfig.get_default_config()
+        # Read-only checks go through the frozen module-level defaults
+        config = SmartCheckConfig.DEFAULT_CONFIG
         
         assert config['total_cycle'] == 0
         assert config['total_time'] == 10080
@@ -51,6 +198,16 @@ class TestSmartCheckConfig:
         assert config['enable_monitor_smart'] is True
         assert config['check_interval'] == 3
     
+    def test_get_default_config_returns_copy(self):
+        """Test get_default_config hands out a mutable copy of the defaults."""
+        config = SmartCheckConfig.get_default_config()
+        assert config == dict(SmartCheckConfig.DEFAULT_CONFIG)
+        
+        config['total_cycle'] = -1
+        assert SmartCheckConfig.DEFAULT_CONFIG['total_cycle'] == 0
+        with pytest.raises(TypeError):
+            SmartCheckConfig.DEFAULT_CONFIG['total_cycle'] = -1
+    
     def test_validate_config_valid(self):
         """Test validation with valid configuration."""
         config = {
@@ -98,35 +255,17 @@ class TestSmartCheckConfig:
 class TestSmartCheckController:
     """Test SmartCheckController class."""
     
-    @pytest.fixture
-    def test_paths(self, tmp_path):
-        """Create test paths."""
-        # Create dummy bat and ini files
-        bat_path = tmp_path / "SmartCheck.bat"
-        ini_path = tmp_path / "SmartCheck.ini"
-        output_dir = tmp_path / "output"
-        
-        bat_path.write_text("@echo off\necho SmartCheck\n")
-        ini_path.write_text("[global]\n")
-        output_dir.mkdir(exist_ok=True)
-        
-        return {
-            'bat_path': str(bat_path),
-            'ini_path': str(ini_path),
-            'output_dir': str(output_dir),
-        }
-    
-    def test_init_basic(self, test_paths):
+    def test_init_basic(self, readonly_paths):
         """Test basic initialization."""
         controller = SmartCheckController(
-            bat_path=test_paths['bat_path'],
-            cfg_ini_path=test_paths['ini_path'],
-            output_dir=test_paths['output_dir']
+            bat_path=readonly_paths['bat_path'],
+            cfg_ini_path=readonly_paths['ini_path'],
+            output_dir=readonly_paths['output_dir']
         )
         
-        assert controller.bat_path == test_paths['bat_path']
-        assert controller.cfg_ini_path == test_paths['ini_path']
-        assert controller.output_dir == test_paths['output_dir']
+        assert controller.bat_path == readonly_paths['bat_path']
+        assert controller.cfg_ini_path == readonly_paths['ini_path']
+        assert controller.output_dir == readonly_paths['output_dir']
         assert controller.status is True  # Initial status should be True
         assert controller.timeout == 60  # Now in minutes (default: 60)
         assert controller.total_cycle == 0
@@ -134,21 +273,21 @@ class TestSmartCheckController:
         assert controller._process is None
         assert controller._stop_event is not None
     
-    def test_init_invalid_bat_path(self, test_paths):
+    def test_init_invalid_bat_path(self, readonly_paths):
         """Test initialization with invalid bat path."""
         with pytest.raises(SmartCheckConfigError, match="SmartCheck.bat not found"):
             SmartCheckController(
                 bat_path="nonexistent.bat",
-                cfg_ini_path=test_paths['ini_path'],
-                output_dir=test_paths['output_dir']
+                cfg_ini_path=readonly_paths['ini_path'],
+                output_dir=readonly_paths['output_dir']
             )
     
-    def test_set_config(self, test_paths):
+    def test_set_config(self, readonly_paths):
         """Test configuration setting."""
         controller = SmartCheckController(
-            bat_path=test_paths['bat_path'],
-            cfg_ini_path=test_paths['ini_path'],
-            output_dir=test_paths['output_dir']
+            bat_path=readonly_paths['bat_path'],
+            cfg_ini_path=readonly_paths['ini_path'],
+            output_dir=readonly_paths['output_dir']
         )
         
         controller.set_config(
@@ -163,53 +302,66 @@ class TestSmartCheckController:
         assert controller.timeout == 10
         assert controller.check_interval == 5
     
-    def test_set_config_invalid(self, test_paths):
+    def test_set_config_invalid(self, readonly_paths):
         """Test configuration setting with invalid values."""
         controller = SmartCheckController(
-            bat_path=test_paths['bat_path'],
-            cfg_ini_path=test_paths['ini_path'],
-            output_dir=test_paths['output_dir']
+            bat_path=readonly_paths['bat_path'],
+            cfg_ini_path=readonly_paths['ini_path'],
+            output_dir=readonly_paths['output_dir']
         )
         
         with pytest.raises(SmartCheckConfigError):
             controller.set_config(total_time=-1)
     
-    def test_update_smartcheck_ini(self, test_paths):
+    def test_update_smartcheck_ini(self, test_paths, fresh_controller):
         """Test updating SmartCheck.ini."""
-        controller = SmartCheckController(
-            bat_path=test_paths['bat_path'],
-            cfg_ini_path=test_paths['ini_path'],
-            output_dir=test_paths['output_dir']
-        )
-        
         # Update a value
-        result = controller.update_smartcheck_ini('global', 'test_key', 'test_value')
+        result = fresh_controller.update_smartcheck_ini('global', 'test_key', 'test_value')
         assert result is True
         
         # Verify it was written
-        config = configparser.ConfigParser()
-        config.read(test_paths['ini_path'])
-        assert config.get('global', 'test_key') == 'test_value'
-    
-    def test_write_all_config_to_ini(self, test_paths):
+        assert 'test_key = test_value\n' in Path(test_paths['ini_path']).read_text()
+
+    def test_update_smartcheck_ini_in_place(self, test_paths, fresh_controller):
+        """Test updating an existing key keeps other sections and keys."""
+        Path(test_paths['ini_path']).write_text(
+            "[global]\ndut_id = 0\ntotal_time = 10\n\n[other]\nkeep = yes\n"
+        )
+        fresh_controller.update_smartcheck_ini('global', 'dut_id', '3')
+        fresh_controller.update_smartcheck_ini('global', 'new_key', 'added')
+        fresh_controller.update_smartcheck_ini('extra', 'flag', 'true')
+
+        ini = _read_ini(test_paths['ini_path'])
+        assert ini['global']['dut_id'] == '3'
+        assert ini['global']['total_time'] == '10'
+        assert ini['global']['new_key'] == 'added'
+        assert ini['other'] == {'keep': 'yes'}
+        assert ini['extra'] == {'flag': 'true'}
+
+    def test_write_all_config_to_ini(self, test_paths, fresh_controller):
         """Test writing all configuration to INI."""
-        controller = SmartCheckController(
-            bat_path=test_paths['bat_path'],
-            cfg_ini_path=test_paths['ini_path'],
-            output_dir=test_paths['output_dir']
-        )
-        
-        controller.set_config(total_time=60, dut_id="2")
-        controller.write_all_config_to_ini()
+        fresh_controller.set_config(total_time=60, dut_id="2")
+        fresh_controller.write_all_config_to_ini()
         
         # Verify all values written
-        config = configparser.ConfigParser()
-        config.read(test_paths['ini_path'])
+        ini_text = Path(test_paths['ini_path']).read_text()
         
-        assert config.get('global', 'total_time') == '60'
-        assert config.get('global', 'dut_id') == '2'
-        assert config.get('global', 'output_dir') == test_paths['output_dir']
-    
+        assert 'total_time = 60\n' in ini_text
+        assert 'dut_id = 2\n' in ini_text
+        assert f"output_dir = {test_paths['output_dir']}\n" in ini_text
+
+    def test_write_all_config_to_ini_keeps_other_sections(self, test_paths, fresh_controller):
+        """Test writing all configuration leaves non-global sections intact."""
+        Path(test_paths['ini_path']).write_text(
+            "[global]\ntotal_time = 1\n\n[test_case]\ncase_1 = enabled\n"
+        )
+        fresh_controller.write_all_config_to_ini()
+
+        ini = _read_ini(test_paths['ini_path'])
+        assert ini['global']['total_time'] == '10080'
+        assert ini['global']['stop_when_failed'] == 'true'
+        assert ini['test_case'] == {'case_1': 'enabled'}
+
     def test_ensure_output_dir_exists(self, test_paths):
         """Test output directory creation."""
         new_dir = Path(test_paths['output_dir']) / "subdir" / "nested"
@@ -223,124 +375,54 @@ class TestSmartCheckController:
         controller.ensure_output_dir_exists()
         assert new_dir.exists()
     
-    def test_find_runcard_ini(self, test_paths):
+    def test_find_runcard_ini(self, test_paths, fresh_controller):
         """Test finding RunCard.ini in output directory."""
-        controller = SmartCheckController(
-            bat_path=test_paths['bat_path'],
-            cfg_ini_path=test_paths['ini_path'],
-            output_dir=test_paths['output_dir']
-        )
-        
         # Create a RunCard.ini in subdirectory
         timestamp_dir = Path(test_paths['output_dir']) / "20260210130000"
         timestamp_dir.mkdir(exist_ok=True)
         runcard = timestamp_dir / "RunCard.ini"
-        runcard.write_text("[Test Status]\ntest_result = ONGOING\n")
+        runcard.write_bytes(_RUNCARD_ONGOING)
         
         # Find it
-        found = controller.find_runcard_ini()
+        found = fresh_controller.find_runcard_ini()
         assert found is not None
         assert found.name == "RunCard.ini"
     
-    def test_read_runcard_status(self, test_paths, tmp_path):
+    def test_read_runcard_status(self, controller, runcards):
         """Test reading RunCard.ini status."""
-        controller = SmartCheckController(
-            bat_path=test_paths['bat_path'],
-            cfg_ini_path=test_paths['ini_path'],
-            output_dir=test_paths['output_dir']
-        )
-        
-        # Create a test RunCard.ini
-        runcard = tmp_path / "RunCard.ini"
-        runcard.write_text("""[Test Status]
-version = SmiWinTools_v20251215C
-test_cases = [1]
-cycle = 5
-loop = 0
-start_time = 2026/2/10 13:00
-elapsed_time = 0h10m
-test_result = PASSED
-err_msg = No Error
-""")
-        
-        status = controller.read_runcard_status(runcard)
+        status = controller.read_runcard_status(runcards['passed'])
         
         assert status['version'] == 'SmiWinTools_v20251215C'
         assert status['cycle'] == 5
         assert status['test_result'] == 'PASSED'
         assert status['err_msg'] == 'No Error'
     
-    def test_check_runcard_status_success(self, test_paths):
-        """Test checking successful RunCard status."""
-        controller = SmartCheckController(
-            bat_path=test_paths['bat_path'],
-            cfg_ini_path=test_paths['ini_path'],
-            output_dir=test_paths['output_dir']
-        )
-        
-        # Test "No Error" case
-        status = {'test_result': 'ONGOING', 'err_msg': 'No Error'}
-        assert controller.check_runcard_status(status) is True
-        
-        # Test "pass" case (case insensitive)
-        status = {'test_result': 'ONGOING', 'err_msg': 'pass'}
-        assert controller.check_runcard_status(status) is True
-    
-    def test_check_runcard_status_failure(self, test_paths):
-        """Test checking failed RunCard status."""
-        controller = SmartCheckController(
-            bat_path=test_paths['bat_path'],
-            cfg_ini_path=test_paths['ini_path'],
-            output_dir=test_paths['output_dir']
-        )
-        
-        # Test FAILED result
-        status = {'test_result': 'FAILED', 'err_msg': 'Error occurred'}
-        assert controller.check_runcard_status(status) is False
-    def test_clear_output_dir(self, test_paths):
+    def test_clear_output_dir(self, test_paths, fresh_controller, dummy_tree):
         """Test clearing output directory."""
-        controller = SmartCheckController(
-            bat_path=test_paths['bat_path'],
-            cfg_ini_path=test_paths['ini_path'],
-            output_dir=test_paths['output_dir']
-        )
+        out_dir = Path(test_paths['output_dir'])
         
-        # Create some test files
-        test_file = Path(test_paths['output_dir']) / "test.txt"
-        test_subdir = Path(test_paths['output_dir']) / "subdir"
-        test_subdir.mkdir(exist_ok=True)
-        test_file.write_text("test content")
-        (test_subdir / "file.txt").write_text("test")
+        # Populate it with some test files
+        shutil.copytree(dummy_tree, out_dir, dirs_exist_ok=True)
         
         # Clear directory
-        controller.clear_output_dir()
+        assert not fresh_controller._cleared_event.is_set()
+        fresh_controller.clear_output_dir()
+        assert fresh_controller._cleared_event.is_set()
         
         # Verify directory is empty but still exists
-        assert Path(test_paths['output_dir']).exists()
-        assert len(list(Path(test_paths['output_dir']).iterdir())) == 0
+        assert out_dir.exists()
+        assert next(out_dir.iterdir(), None) is None
     
-    def test_load_config_from_json(self, test_paths, tmp_path):
+    def test_load_config_from_json(self, readonly_paths, json_configs):
         """Test loading configuration from JSON file."""
         controller = SmartCheckController(
-            bat_path=test_paths['bat_path'],
-            cfg_ini_path=test_paths['ini_path'],
-            output_dir=test_paths['output_dir']
+            bat_path=readonly_paths['bat_path'],
+            cfg_ini_path=readonly_paths['ini_path'],
+            output_dir=readonly_paths['output_dir']
         )
         
-        # Create a JSON config file
-        json_config = {
-            "smartcheck": {
-                "total_time": 30,
-                "dut_id": "5",
-                "timeout": 15,
-                "total_cycle": 10
-            }
-        }
-        json_path = tmp_path / "config.json"
-        json_path.write_text(json.dumps(json_config))
-        
         # Load configuration
-        controller.load_config_from_json(str(json_path))
+        controller.load_config_from_json(str(json_configs['valid']))
         
         # Verify configuration was loaded
         assert controller.total_time == 30
@@ -348,27 +430,35 @@ err_msg = No Error
         assert controller.timeout == 15
         assert controller.total_cycle == 10
     
-    def test_load_config_from_json_missing_section(self, test_paths, tmp_path):
+    def test_load_config_from_json_missing_section(self, readonly_paths, json_configs):
         """Test loading JSON without 'smartcheck' section."""
         controller = SmartCheckController(
-            bat_path=test_paths['bat_path'],
-            cfg_ini_path=test_paths['ini_path'],
-            output_dir=test_paths['output_dir']
+            bat_path=readonly_paths['bat_path'],
+            cfg_ini_path=readonly_paths['ini_path'],
+            output_dir=readonly_paths['output_dir']
         )
         
-        json_config = {"other": {}}
-        json_path = tmp_path / "config.json"
-        json_path.write_text(json.dumps(json_config))
-        
         with pytest.raises(SmartCheckConfigError, match="'smartcheck' section not found"):
-            controller.load_config_from_json(str(json_path))
-    
-    def test_load_config_from_json_invalid_file(self, test_paths):
+            controller.load_config_from_json(str(json_configs['no_section']))
+
+    def test_load_config_from_json_unknown_keys(self, readonly_paths, json_configs):
+        """Test loading JSON reports all unknown keys together."""
+        controller = SmartCheckController(
+            bat_path=readonly_paths['bat_path'],
+            cfg_ini_path=readonly_paths['ini_path'],
+            output_dir=readonly_paths['output_dir']
+        )
+
+        with pytest.raises(SmartCheckConfigError, match="bar, foo"):
+            controller.load_config_from_json(str(json_configs['unknown_keys']))
+        assert controller.total_time == 10080  # nothing applied
+
+    def test_load_config_from_json_invalid_file(self, readonly_paths):
         """Test loading from non-existent JSON file."""
         controller = SmartCheckController(
-            bat_path=test_paths['bat_path'],
-            cfg_ini_path=test_paths['ini_path'],
-            output_dir=test_paths['output_dir']
+            bat_path=readonly_paths['bat_path'],
+            cfg_ini_path=readonly_paths['ini_path'],
+            output_dir=readonly_paths['output_dir']
         )
         
         with pytest.raises(SmartCheckConfigError, match="not found"):
@@ -378,72 +468,37 @@ err_msg = No Error
 class TestSmartCheckControllerProcessControl:
     """Test process control methods with mocks."""
     
-    @pytest.fixture
-    def test_paths(self, tmp_path):
-        """Create test paths."""
-        bat_path = tmp_path / "SmartCheck.bat"
-        ini_path = tmp_path / "SmartCheck.ini"
-        output_dir = tmp_path / "output"
-        
-        bat_path.write_text("@echo off\necho SmartCheck\n")
-        ini_path.write_text("[global]\n")
-        output_dir.mkdir(exist_ok=True)
-        
-        return {
-            'bat_path': str(bat_path),
-            'ini_path': str(ini_path),
-            'output_dir': str(output_dir),
-        }
-    
-    @patch('subprocess.Popen')
-    def test_start_smartcheck_bat(self, mock_popen, test_paths):
+    @patch('subprocess.Popen', autospec=True)
+    def test_start_smartcheck_bat(self, mock_popen, fresh_controller):
         """Test starting SmartCheck.bat process."""
-        # Setup mock process
-        mock_process = MagicMock()
-        mock_process.poll.return_value = None  # Process is running
-        mock_process.pid = 12345
-        mock_popen.return_value = mock_process
-        
-        controller = SmartCheckController(
-            bat_path=test_paths['bat_path'],
-            cfg_ini_path=test_paths['ini_path'],
-            output_dir=test_paths['output_dir']
-        )
+        # Setup mock process that keeps running
+        mock_popen.return_value = _make_proc()
         
         # Start the process
-        result = controller.start_smartcheck_bat()
+        result = fresh_controller.start_smartcheck_bat()
         
         # Verify
         assert result is True
-        assert controller._process is not None
-        assert controller._process.pid == 12345
+        assert fresh_controller._process is not None
+        assert fresh_controller._process.pid == 12345
         mock_popen.assert_called_once()
     
-    @patch('subprocess.Popen')
-    def test_start_smartcheck_bat_immediate_exit(self, mock_popen, test_paths):
+    @patch('subprocess.Popen', autospec=True)
+    def test_start_smartcheck_bat_immediate_exit(self, mock_popen, fresh_controller):
         """Test starting SmartCheck.bat that exits immediately."""
         # Setup mock process that exits immediately
-        mock_process = MagicMock()
-        mock_process.poll.return_value = 1  # Process exited
-        mock_process.returncode = 1
-        mock_popen.return_value = mock_process
-        
-        controller = SmartCheckController(
-            bat_path=test_paths['bat_path'],
-            cfg_ini_path=test_paths['ini_path'],
-            output_dir=test_paths['output_dir']
-        )
+        mock_popen.return_value = _make_proc(poll_rv=1, returncode=1)
         
         # Should raise exception
         with pytest.raises(SmartCheckProcessError, match="terminated immediately"):
-            controller.start_smartcheck_bat()
+            fresh_controller.start_smartcheck_bat()
     
-    def test_stop_smartcheck_bat_no_process(self, test_paths):
+    def test_stop_smartcheck_bat_no_process(self, readonly_paths):
         """Test stopping when no process is running."""
         controller = SmartCheckController(
-            bat_path=test_paths['bat_path'],
-            cfg_ini_path=test_paths['ini_path'],
-            output_dir=test_paths['output_dir']
+            bat_path=readonly_paths['bat_path'],
+            cfg_ini_path=readonly_paths['ini_path'],
+            output_dir=readonly_paths['output_dir']
         )
         
         # Should not raise exception
@@ -451,18 +506,16 @@ class TestSmartCheckControllerProcessControl:
         assert controller._process is None
     
     @patch('subprocess.run')
-    def test_stop_smartcheck_bat_graceful(self, mock_run, test_paths):
+    def test_stop_smartcheck_bat_graceful(self, mock_run, readonly_paths):
         """Test graceful process termination."""
         controller = SmartCheckController(
-            bat_path=test_paths['bat_path'],
-            cfg_ini_path=test_paths['ini_path'],
-            output_dir=test_paths['output_dir']
+            bat_path=readonly_paths['bat_path'],
+            cfg_ini_path=readonly_paths['ini_path'],
+            output_dir=readonly_paths['output_dir']
         )
         
         # Setup mock process
-        mock_process = MagicMock()
-        mock_process.poll.return_value = None  # Running
-        mock_process.pid = 12345
+        mock_process = _make_proc()  # Running
         controller._process = mock_process
         
         # Stop the process
@@ -473,18 +526,16 @@ class TestSmartCheckControllerProcessControl:
         assert controller._process is None
     
     @patch('subprocess.run')
-    def test_stop_smartcheck_bat_force(self, mock_run, test_paths):
+    def test_stop_smartcheck_bat_force(self, mock_run, readonly_paths):
         """Test force process termination."""
         controller = SmartCheckController(
-            bat_path=test_paths['bat_path'],
-            cfg_ini_path=test_paths['ini_path'],
-            output_dir=test_paths['output_dir']
+            bat_path=readonly_paths['bat_path'],
+            cfg_ini_path=readonly_paths['ini_path'],
+            output_dir=readonly_paths['output_dir']
         )
         
         # Setup mock process
-        mock_process = MagicMock()
-        mock_process.poll.return_value = None
-        mock_process.pid = 12345
+        mock_process = _make_proc()
         controller._process = mock_process
         
         # Force stop
@@ -494,107 +545,103 @@ class TestSmartCheckControllerProcessControl:
         mock_process.kill.assert_called_once()
         assert controller._process is None
 
+    def test_run_timeout_sets_status_false(self, fresh_controller, monkeypatch):
+        """Test run() stops on timeout, using a fake clock instead of waiting."""
+        fresh_controller.set_config(timeout=1, check_interval=1)  # 1 minute
+
+        # Every clock read advances 30 virtual seconds; sleeping is a no-op
+        clock = iter(range(0, 10000, 30))
+        fake_time = Mock(spec=['monotonic', 'sleep'])
+        fake_time.monotonic.side_effect = lambda: next(clock)
+        monkeypatch.setattr('lib.testtool.smartcheck.controller.time', fake_time)
+        monkeypatch.setattr(fresh_controller, 'start_smartcheck_bat', Mock(return_value=True))
+
+        fresh_controller.run()
+
+        assert fresh_controller.status is False
+        fresh_controller.start_smartcheck_bat.assert_called_once()
+        fake_time.sleep.assert_called_once_with(1)  # one poll, then timeout
+
 
 class TestSmartCheckControllerRunCardMonitoring:
     """Test RunCard.ini monitoring methods."""
     
-    @pytest.fixture
-    def test_paths(self, tmp_path):
-        """Create test paths."""
-        bat_path = tmp_path / "SmartCheck.bat"
-        ini_path = tmp_path / "SmartCheck.ini"
-        output_dir = tmp_path / "output"
-        
-        bat_path.write_text("@echo off\n")
-        ini_path.write_text("[global]\n")
-        output_dir.mkdir(exist_ok=True)
-        
-        return {
-            'bat_path': str(bat_path),
-            'ini_path': str(ini_path),
-            'output_dir': str(output_dir),
-        }
-    
-    def test_find_runcard_ini_not_found(self, test_paths):
+    def test_find_runcard_ini_not_found(self, controller):
         """Test finding RunCard.ini when it doesn't exist."""
-        controller = SmartCheckController(
-            bat_path=test_paths['bat_path'],
-            cfg_ini_path=test_paths['ini_path'],
-            output_dir=test_paths['output_dir']
-        )
-        
         result = controller.find_runcard_ini()
         assert result is None
     
-    def test_find_runcard_ini_in_subdirectory(self, test_paths):
+    def test_find_runcard_ini_in_subdirectory(self, test_paths, fresh_controller):
         """Test finding RunCard.ini in timestamp subdirectory."""
-        controller = SmartCheckController(
-            bat_path=test_paths['bat_path'],
-            cfg_ini_path=test_paths['ini_path'],
-            output_dir=test_paths['output_dir']
-        )
-        
         # Create RunCard.ini in subdirectory
         timestamp_dir = Path(test_paths['output_dir']) / "20260210150000"
         timestamp_dir.mkdir(exist_ok=True)
         runcard = timestamp_dir / "RunCard.ini"
-        runcard.write_text("[Test Status]\ntest_result = ONGOING\n")
+        runcard.write_bytes(_RUNCARD_ONGOING)
         
-        result = controller.find_runcard_ini()
+        result = fresh_controller.find_runcard_ini()
         
         assert result is not None
         assert result.name == "RunCard.ini"
         assert result.parent.name == "20260210150000"
     
-    def test_find_runcard_ini_multiple_files(self, test_paths):
+    def test_find_runcard_ini_multiple_files(self, test_paths, fresh_controller):
         """Test finding most recent RunCard.ini when multiple exist."""
-        controller = SmartCheckController(
-            bat_path=test_paths['bat_path'],
-            cfg_ini_path=test_paths['ini_path'],
-            output_dir=test_paths['output_dir']
-        )
+        out_dir = Path(test_paths['output_dir'])
         
         # Create multiple RunCard.ini files
-        old_dir = Path(test_paths['output_dir']) / "20260210100000"
+        old_dir = out_dir / "20260210100000"
         old_dir.mkdir(exist_ok=True)
         old_runcard = old_dir / "RunCard.ini"
-        old_runcard.write_text("[Test Status]\n")
-        
-        time.sleep(0.1)  # Ensure different timestamps
+        old_runcard.write_bytes(_RUNCARD_EMPTY)
         
-        new_dir = Path(test_paths['output_dir']) / "20260210150000"
+        new_dir = out_dir / "20260210150000"
         new_dir.mkdir(exist_ok=True)
         new_runcard = new_dir / "RunCard.ini"
-        new_runcard.write_text("[Test Status]\n")
+        new_runcard.write_bytes(_RUNCARD_EMPTY)
         
-        result = controller.find_runcard_ini()
+        # Set distinct mtimes explicitly instead of sleeping between writes
+        os.utime(old_runcard, (1_700_000_000, 1_700_000_000))
+        os.utime(new_runcard, (1_700_000_100, 1_700_000_100))
+        
+        result = fresh_controller.find_runcard_ini()
         
         # Should return the most recent one
         assert result is not None
         assert result.parent.name == "20260210150000"
+
+    def test_find_runcard_ini_fallback_uses_mtime(self, test_paths, fresh_controller):
+        """Test non-timestamp directories fall back to the newest file mtime."""
+        out_dir = Path(test_paths['output_dir'])
+        # Name order ("b" > "a") disagrees with mtime order on purpose
+        newer = out_dir / "run_a" / "RunCard.ini"
+        older = out_dir / "run_b" / "RunCard.ini"
+        for runcard in (newer, older):
+            runcard.parent.mkdir()
+            runcard.write_bytes(_RUNCARD_EMPTY)
+        os.utime(older, (1_700_000_000, 1_700_000_000))
+        os.utime(newer, (1_700_000_100, 1_700_000_100))
+
+        assert fresh_controller.find_runcard_ini() == newer
+
+    def test_find_runcard_ini_cached_until_cleared(self, test_paths, fresh_controller):
+        """Test the found path is reused without rescanning until clear_output_dir."""
+        run_dir = Path(test_paths['output_dir']) / "20260210100000"
+        run_dir.mkdir()
+        (run_dir / "RunCard.ini").write_bytes(_RUNCARD_EMPTY)
+        first = fresh_controller.find_runcard_ini()
+
+        with patch('os.scandir') as mock_scandir:
+            assert fresh_controller.find_runcard_ini() == first
+            mock_scandir.assert_not_called()
+
+        fresh_controller.clear_output_dir()
+        assert fresh_controller._runcard_path is None
+        assert fresh_controller.find_runcard_ini() is None
     
-    def test_read_runcard_status_all_fields(self, test_paths, tmp_path):
+    def test_read_runcard_status_all_fields(self, controller, runcards):
         """Test reading all fields from RunCard.ini."""
-        controller = SmartCheckController(
-            bat_path=test_paths['bat_path'],
-            cfg_ini_path=test_paths['ini_path'],
-            output_dir=test_paths['output_dir']
-        )
-        
-        # Create comprehensive RunCard.ini
-        runcard = tmp_path / "RunCard.ini"
-        runcard.write_text("""[Test Status]
-version = SmiWinTools_v20251215C
-test_cases = [1]
-cycle = 10
-loop = 2
-start_time = 2026/2/10 15:00
-elapsed_time = 1h30m
-test_result = ONGOING
-err_msg = No Error
-""")
-        
-        status = controller.read_runcard_status(runcard)
+        status = controller.read_runcard_status(runcards['all_fields'])
         
         assert status['version'] == 'SmiWinTools_v20251215C'
         assert status['test_cases'] == '[1]'
@@ -604,116 +651,70 @@ err_msg = No Error
         assert status['elapsed_time'] == '1h30m'
         assert status['test_result'] == 'ONGOING'
         assert status['err_msg'] == 'No Error'
-    
-    def test_read_runcard_status_missing_section(self, test_paths, tmp_path):
+
+    def test_read_runcard_status_crlf(self, controller, runcards):
+        """Test RunCard.ini written with Windows line endings."""
+        status = controller.read_runcard_status(runcards['crlf'])
+
+        assert status['cycle'] == 7
+        assert status['test_result'] == 'PASSED'
+        assert status['err_msg'] == 'No Error'
+
+    def test_read_runcard_status_missing_section(self, controller, runcards):
         """Test reading RunCard.ini without [Test Status] section."""
-        controller = SmartCheckController(
-            bat_path=test_paths['bat_path'],
-            cfg_ini_path=test_paths['ini_path'],
-            output_dir=test_paths['output_dir']
-        )
-        
-        runcard = tmp_path / "RunCard.ini"
-        runcard.write_text("[Other Section]\nkey = value\n")
-        
         with pytest.raises(SmartCheckRunCardError, match="Test Status.*section not found"):
-            controller.read_runcard_status(runcard)
-    
-    def test_check_runcard_status_ongoing_no_error(self, test_paths):
-        """Test checking status with ONGOING and No Error."""
-        controller = SmartCheckController(
-            bat_path=test_paths['bat_path'],
-            cfg_ini_path=test_paths['ini_path'],
-            output_dir=test_paths['output_dir']
-        )
-        
-        status = {
-            'test_result': 'ONGOING',
-            'err_msg': 'No Error'
-        }
-        
-        assert controller.check_runcard_status(status) is True
-    
-    def test_check_runcard_status_pass_case_insensitive(self, test_paths):
-        """Test checking status with 'pass' (case insensitive)."""
-        controller = SmartCheckController(
-            bat_path=test_paths['bat_path'],
-            cfg_ini_path=test_paths['ini_path'],
-            output_dir=test_paths['output_dir']
-        )
-        
-        # Test different cases
-        for msg in ['pass', 'PASS', 'Pass', 'pAsS']:
-            status = {'test_result': 'ONGOING', 'err_msg': msg}
-            assert controller.check_runcard_status(status) is True
-    
-    def test_check_runcard_status_failed_result(self, test_paths):
-        """Test checking status with FAILED result."""
-        controller = SmartCheckController(
-            bat_path=test_paths['bat_path'],
-            cfg_ini_path=test_paths['ini_path'],
-            output_dir=test_paths['output_dir']
-        )
-        
-        status = {
-            'test_result': 'FAILED',
-            'err_msg': 'Test failed'
-        }
-        
-        assert controller.check_runcard_status(status) is False
-    
-    def test_check_runcard_status_error_message(self, test_paths):
-        """Test checking status with error message."""
-        controller = SmartCheckController(
-            bat_path=test_paths['bat_path'],
-            cfg_ini_path=test_paths['ini_path'],
-            output_dir=test_paths['output_dir']
-        )
-        
-        status = {
-            'test_result': 'ONGOING',
-            'err_msg': 'Some error occurred'
-        }
-        
-        assert controller.check_runcard_status(status) is False
+            controller.read_runcard_status(runcards['missing_section'])
+
+    def test_read_runcard_status_ignores_other_sections(self, controller, runcards):
+        """Test only keys inside [Test Status] are read."""
+        status = controller.read_runcard_status(runcards['other_sections'])
+
+        assert status['cycle'] == 3
+        assert status['loop'] == 0
+        assert status['test_result'] == 'FAILED'
+        assert status['err_msg'] == 'No Error'
 
+    @pytest.mark.parametrize("test_result,err_msg,expected", [
+        ('ONGOING', 'No Error', True),
+        ('ONGOING', 'pass', True),
+        ('ONGOING', 'PASS', True),
+        ('ONGOING', 'Pass', True),
+        ('ONGOING', 'pAsS', True),
+        ('FAILED', 'Error occurred', False),
+        ('FAILED', 'Test failed', False),
+        ('ONGOING', 'Some error occurred', False),
+    ])
+    def test_check_runcard_status(self, controller, test_result, err_msg, expected):
+        """Test RunCard status evaluation (err_msg is case-insensitive)."""
+        status = {'test_result': test_result, 'err_msg': err_msg}
+        
+        assert controller.check_runcard_status(status) is expected
 
+@pytest.mark.real_bat
+@pytest.mark.slow
 class TestSmartCheckControllerThreadExecution:
     """Test thread execution with real SmartCheck.bat."""
     
     @pytest.fixture
-    def real_paths(self):
+    def real_paths(self, smartcheck_bat_path, tmp_path):
         """Get real SmartCheck.bat paths for testing."""
         # Use the actual SmartCheck.bat from the test bin directory
-        # Path: tests/unit/lib/testtool/test_smartcheck/test_controller.py
-        # Target: tests/unit/lib/testtool/bin/SmiWinTools/
-        base_path = Path(__file__).parent.parent / "bin" / "SmiWinTools"
-        bat_path = base_path / "SmartCheck.bat"
+        # (tests/unit/lib/testtool/bin/SmiWinTools/, resolved in conftest.py)
+        bat_path = smartcheck_bat_path
+        base_path = bat_path.parent
         ini_path = base_path / "SmartCheck.ini"
-        output_dir = base_path / "test_thread_output"
-        
-        # Ensure paths exist
-        if not bat_path.exists():
-            pytest.skip(f"SmartCheck.bat not found at {bat_path}")
-        if not ini_path.exists():
-            pytest.skip(f"SmartCheck.ini not found at {ini_path}")
+        # Per-test output directory so parallel workers never share one
+        output_dir = tmp_path / "test_thread_output"
         
-        # Create output directory
+        # No exists() checks: conftest skips real_bat tests at collection
+        # when SmartCheck.bat or SmartCheck.ini is missing
         output_dir.mkdir(exist_ok=True)
         
-        yield {
+        return {
             'bat_path': str(bat_path),
             'ini_path': str(ini_path),
             'output_dir': str(output_dir),
         }
-        
-        # Cleanup after test
-        import shutil
-        if output_dir.exists():
-            try:
-                shutil.rmtree(output_dir)
-            except Exception as e:
-                print(f"Cleanup warning: {e}")
     
     def test_thread_basic_execution(self, real_paths):
         """Test basic thread execution with real SmartCheck.bat."""
@@ -733,8 +734,8 @@ class TestSmartCheckControllerThreadExecution:
         # Start the thread
         controller.start()
         
-        # Wait a bit for SmartCheck to start
-        time.sleep(5)
+        # Wait for SmartCheck.bat to be launched (up to 5 seconds)
+        assert _wait_until(lambda: controller._process is not None, timeout=5)
         
         # Verify thread is running
         assert controller.is_alive()
@@ -766,17 +767,11 @@ class TestSmartCheckControllerThreadExecution:
         controller.start()
         
         # Wait for RunCard.ini to be created (up to 5 minutes)
-        runcard_found = False
-        max_wait_time = 300  # 5 minutes
-        start_time = time.time()
-        
-        while time.time() - start_time < max_wait_time:
-            runcard_path = controller.find_runcard_ini()
-            if runcard_path:
-                runcard_found = True
-                print(f"RunCard.ini found at: {runcard_path}")
-                break
-            time.sleep(5)
+        runcard_found = _wait_until(
+            lambda: controller.find_runcard_ini() is not None, timeout=300, interval=0.2
+        )
+        if runcard_found:
+            print(f"RunCard.ini found at: {controller.find_runcard_ini()}")
         
         # Verify RunCard.ini was created within 5 minutes
         assert runcard_found, "RunCard.ini should be created within 5 minutes"
@@ -805,12 +800,12 @@ class TestSmartCheckControllerThreadExecution:
         )
         
         # Start the thread
-        start_time = time.time()
+        start_time = time.monotonic()
         controller.start()
         
         # Wait for thread to complete
         controller.join(timeout=10)
-        elapsed_time = time.time() - start_time
+        elapsed_time = time.monotonic() - start_time
         
         # Verify thread completed within timeout + some buffer
         assert not controller.is_alive()
@@ -819,7 +814,7 @@ class TestSmartCheckControllerThreadExecution:
         # Status should be False due to timeout
         assert controller.status is False
     
-    def test_thread_clear_output_dir_before_execution(self, real_paths):
+    def test_thread_clear_output_dir_before_execution(self, real_paths, dummy_tree):
         """Test thread clears output directory before execution."""
         controller = SmartCheckController(
             bat_path=real_paths['bat_path'],
@@ -827,17 +822,13 @@ class TestSmartCheckControllerThreadExecution:
             output_dir=real_paths['output_dir']
         )
         
-        # Create some dummy files in output directory
-        dummy_file = Path(real_paths['output_dir']) / "dummy.txt"
-        dummy_file.write_text("This should be deleted")
+        # Put some dummy files in output directory
+        output_dir = real_paths['output_dir']
+        shutil.copytree(dummy_tree, output_dir, dirs_exist_ok=True)
+        dummy_names = set(os.listdir(dummy_tree))
         
-        dummy_dir = Path(real_paths['output_dir']) / "dummy_dir"
-        dummy_dir.mkdir(exist_ok=True)
-        (dummy_dir / "file.txt").write_text("test")
-        
-        # Verify files exist before starting
-        assert dummy_file.exists()
-        assert dummy_dir.exists()
+        # Verify files exist before starting (one listing covers all of them)
+        assert dummy_names <= set(os.listdir(output_dir))
         
         # Configure for short test
         controller.set_config(
@@ -849,18 +840,16 @@ class TestSmartCheckControllerThreadExecution:
         # Start the thread
         controller.start()
         
-        # Wait a bit for clear_output_dir to execute
-        time.sleep(3)
-        
-        # Check if dummy files were deleted
-        # Note: clear_output_dir is called in run() method
-        files_deleted = not dummy_file.exists() and not dummy_dir.exists()
+        # Wait for run() to finish clear_output_dir
+        cleared = controller._cleared_event.wait(timeout=10)
+        files_deleted = dummy_names.isdisjoint(os.listdir(output_dir))
         
         # Stop the thread
         controller.stop()
         controller.join(timeout=30)
         
         # Verify dummy files were cleared
+        assert cleared, "clear_output_dir did not run"
         assert files_deleted, "Output directory should be cleared before execution"
     
     def test_thread_stop_event_functionality(self, real_paths):
@@ -885,8 +874,8 @@ class TestSmartCheckControllerThreadExecution:
         # Start the thread
         controller.start()
         
-        # Let it run for a few seconds
-        time.sleep(5)
+        # Let it run until SmartCheck.bat is launched (up to 5 seconds)
+        _wait_until(lambda: controller._process is not None, timeout=5)
         
         # Request stop
         controller.stop()
@@ -924,12 +913,12 @@ class TestSmartCheckControllerThreadExecution:
         )
         
         # Start the thread
-        start_time = time.time()
+        start_time = time.monotonic()
         controller.start()
         
         # Wait for thread to complete (should fail at 5 minute mark)
         controller.join(timeout=400)  # Wait up to 6.5 minutes
-        elapsed_time = time.time() - start_time
+        elapsed_time = time.monotonic() - start_time
         
         # Verify thread completed
         assert not controller.is_alive()
@@ -963,48 +952,42 @@ class TestSmartCheckControllerThreadExecution:
         
         # Monitor for 5 minutes (300 seconds)
         test_duration = 300  # 5 minutes
-        start_time = time.time()
+        start_time = time.monotonic()
+        deadline = start_time + test_duration
         check_interval = 10  # Check status every 10 seconds
         
-        status_checks = []
+        # Each check asserts directly, so only the count is kept; the
+        # per-check line is captured by pytest and shown only on failure
+        checks = 0
         
-        while time.time() - start_time < test_duration:
-            elapsed = time.time() - start_time
-            
-            # Record status
+        while True:
+            elapsed = time.monotonic() - start_time
             current_status = controller.status
-            status_checks.append({
-                'time': elapsed,
-                'status': current_status,
-                'is_alive': controller.is_alive()
-            })
+            alive = controller.is_alive()
+            checks += 1
             
-            print(f"[{elapsed:.1f}s] Status: {current_status}, Thread alive: {controller.is_alive()}")
+            print(f"[{elapsed:.1f}s] Status: {current_status}, Thread alive: {alive}")
             
             # Verify status hasn't turned False during execution
             assert current_status is True, f"Status became False at {elapsed:.1f}s"
             
             # Verify thread is still running
-            assert controller.is_alive(), f"Thread died at {elapsed:.1f}s"
+            assert alive, f"Thread died at {elapsed:.1f}s"
             
-            time.sleep(check_interval)
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            # join() returns as soon as the thread exits, so a failure is
+            # caught at the next check instead of after a full interval
+            controller.join(timeout=min(check_interval, remaining))
         
         # After 5 minutes, stop the thread
-        print(f"5 minutes completed, stopping thread...")
+        print(f"5 minutes completed after {checks} status checks, stopping thread...")
         controller.stop()
         controller.join(timeout=30)
         
         # Verify thread stopped
         assert not controller.is_alive()
-        
-        # Print summary
-        print(f"\nStatus checks summary:")
-        print(f"Total checks: {len(status_checks)}")
-        print(f"All status True: {all(check['status'] for check in status_checks)}")
-        
-        # Final verification: status should have remained True throughout
-        all_status_true = all(check['status'] for check in status_checks)
-        assert all_status_true, "Status changed to False during 5-minute execution"
 
 
 @pytest.mark.integration
@@ -24,8 +24,77 @@ import configparser
 import glob
 import shutil
 
+from tests.unit.lib.testtool.test_smartcheck._helpers import backoff
+
 pytestmark = [pytest.mark.real_bat, pytest.mark.real, pytest.mark.hardware]
 
+_SMIWINTOOLS_DIR = Path(__file__).resolve().parent.parent / "bin" / "SmiWinTools"
+
+# The tests only poll files, so SmartCheck.bat gets a hidden console instead
+# of a new conhost window. DETACHED_PROCESS is not used: a console-less
+# cmd.exe would make every console child it starts open its own window.
+# getattr keeps collection working off Windows, where the flag is undefined.
+_CREATIONFLAGS = getattr(subprocess, 'CREATE_NO_WINDOW', 0)
+
+
+# Reused by _read_ini for every poll instead of building a parser per read.
+# The tests here are single-threaded, so one shared instance is safe.
+_INI_PARSER = configparser.ConfigParser()
+
+
+def _read_ini(path):
+    """
+    Load path into the shared parser and return it, or None if path is missing.
+    
+    The parser is reset first, so nothing carries over from the previous
+    file; callers must copy out what they need before the next call.
+    """
+    _INI_PARSER.clear()
+    _INI_PARSER.defaults().clear()
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            _INI_PARSER.read_file(f)
+    except FileNotFoundError:
+        return None
+    return _INI_PARSER
+
+
+def _subdir_names(path):
+    """
+    Return the names of the subdirectories of path.
+    
+    Uses os.scandir so the entry type comes from the directory listing
+    itself rather than one stat() per entry.
+    """
+    with os.scandir(path) as it:
+        return {entry.name for entry in it if entry.is_dir(follow_symlinks=False)}
+
+
+def _mtime_ns(path):
+    """Return the mtime of path in nanoseconds, or None if it does not exist."""
+    try:
+        return os.stat(path).st_mtime_ns
+    except FileNotFoundError:
+        return None
+
+
+def _first_new_subdir(path, baseline):
+    """
+    Return the name of the first subdirectory of path not in baseline.
+    
+    Stops scanning at the first match; SmartCheck.bat creates a single
+    timestamp directory per run. Returns None if there is none yet or
+    path does not exist.
+    """
+    try:
+        with os.scandir(path) as it:
+            for entry in it:
+                if entry.name not in baseline and entry.is_dir(follow_symlinks=False):
+                    return entry.name
+    except FileNotFoundError:
+        pass
+    return None
+
 
 class TestDirectSmartCheckBat:
     """Directly test the real behavior of SmartCheck.bat."""
@@ -33,7 +102,7 @@ class TestDirectSmartCheckBat:
     @pytest.fixture
     def smiwintools_dir(self):
         """Directory that contains SmartCheck.bat."""
-        return Path(__file__).resolve().parent.parent / "bin" / "SmiWinTools"
+        return _SMIWINTOOLS_DIR
     
     @pytest.fixture
     def smartcheck_bat(self, smiwintools_dir):
@@ -60,25 +129,25 @@ class TestDirectSmartCheckBat:
     def find_latest_smartcheck_log_dir(self, smiwintools_dir):
         """Find the newest SmartCheck log directory."""
         log_base = smiwintools_dir / "log_SmartCheck"
-        if not log_base.exists():
+        try:
+            subdirs = _subdir_names(log_base)
+        except FileNotFoundError:
             return None
         
         # Find all timestamp directories (format: YYYYMMDDHHMMSS)
-        timestamp_dirs = [d for d in log_base.iterdir() if d.is_dir() and d.name.isdigit()]
-        if not timestamp_dirs:
+        names = [name for name in subdirs if name.isdigit()]
+        if not names:
             return None
         
         # Return the latest (sorted by name; largest is newest)
-        return max(timestamp_dirs, key=lambda d: d.name)
+        return log_base / max(names)
     
     def read_smartcheck_ini(self, smartcheck_ini_path):
         """Read SmartCheck.ini (large config file with full settings)."""
-        if not smartcheck_ini_path.exists():
+        config = _read_ini(smartcheck_ini_path)
+        if config is None:
             return None
         
-        config = configparser.ConfigParser()
-        config.read(smartcheck_ini_path)
-        
         # SmartCheck.ini is a config file with a [global] section
         if 'global' in config:
             return {
@@ -93,12 +162,10 @@ class TestDirectSmartCheckBat:
     
     def read_runcard_ini(self, runcard_ini_path):
         """Read RunCard.ini status file (small file, status only)."""
-        if not runcard_ini_path.exists():
+        config = _read_ini(runcard_ini_path)
+        if config is None:
             return None
         
-        config = configparser.ConfigParser()
-        config.read(runcard_ini_path)
-        
         # Try different section names
         for section_name in ['Test Status', 'Result', 'STATUS']:
             if section_name in config:
@@ -144,10 +211,10 @@ class TestDirectSmartCheckBat:
         # Check for existing log directories
         log_base_dir = smiwintools_dir / "log_SmartCheck"
         if log_base_dir.exists():
-            existing_dirs = list(log_base_dir.iterdir())
-            print(f"  ⚠️ log_SmartCheck exists and contains {len(existing_dirs)} subdirectories")
-            if existing_dirs:
-                print(f"  Latest directory: {max(existing_dirs, key=lambda d: d.name).name}")
+            existing_names = os.listdir(log_base_dir)
+            print(f"  ⚠️ log_SmartCheck exists and contains {len(existing_names)} subdirectories")
+            if existing_names:
+                print(f"  Latest directory: {max(existing_names)}")
         
         # Switch to SmiWinTools directory for execution (important!)
         original_dir = os.getcwd()
@@ -160,9 +227,11 @@ class TestDirectSmartCheckBat:
         try:
             # Start process
             process = subprocess.Popen(
-                str(smartcheck_bat),
-                creationflags=subprocess.CREATE_NEW_CONSOLE,
-                cwd=str(smiwintools_dir)
+                os.fspath(smartcheck_bat),
+                creationflags=_CREATIONFLAGS,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+                cwd=os.fspath(smiwintools_dir)
             )
             print(f"  Process PID: {process.pid}")
             print(f"  Process started successfully")
@@ -171,17 +240,27 @@ class TestDirectSmartCheckBat:
             print(f"\n[4] Monitor creation of log_SmartCheck and process status:")
             
             monitor_duration = 120  # monitor for 120 seconds
-            check_interval = 2  # check every 2 seconds
+            check_interval = 2  # back off to checking every 2 seconds
             log_dir_found = False
             latest_log_dir = None
             initial_log_dirs = set()
             
             # Record initial state
-            if log_base_dir.exists():
-                initial_log_dirs = {d.name for d in log_base_dir.iterdir() if d.is_dir()}
+            try:
+                initial_log_dirs = _subdir_names(log_base_dir)
+            except FileNotFoundError:
+                pass
+            
+            # log_SmartCheck's mtime only changes when entries are added or
+            # removed, so polls skip the scan while it stays the same
+            prev_log_mtime = None
             
-            for i in range(int(monitor_duration / check_interval)):
-                time.sleep(check_interval)
+            deadline = time.monotonic() + monitor_duration
+            for i, delay in enumerate(backoff(cap=check_interval)):
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                time.sleep(min(delay, remaining))
                 current_time = datetime.now().strftime('%H:%M:%S')
                 
                 # Check process status
@@ -190,46 +269,44 @@ class TestDirectSmartCheckBat:
                     print(f"  [{i+1}] {current_time} - ⚠️ SmartCheck.bat ended (returncode={returncode})")
                     
                     # Check whether a new directory was created
-                    if log_base_dir.exists():
-                        current_log_dirs = {d.name for d in log_base_dir.iterdir() if d.is_dir()}
-                        new_dirs = current_log_dirs - initial_log_dirs
-                        if new_dirs:
-                            print(f"       Found new directories: {', '.join(new_dirs)}")
-                            latest_log_dir = log_base_dir / max(new_dirs)
-                        else:
-                            print(f"       ⚠️ No new directories created")
+                    new_dir = _first_new_subdir(log_base_dir, initial_log_dirs)
+                    if new_dir:
+                        print(f"       Found new directory: {new_dir}")
+                        latest_log_dir = log_base_dir / new_dir
+                    else:
+                        print(f"       ⚠️ No new directories created")
                     break
                 
-                # Check log_SmartCheck directory
-                if log_base_dir.exists():
-                    current_log_dirs = {d.name for d in log_base_dir.iterdir() if d.is_dir()}
-                    new_dirs = current_log_dirs - initial_log_dirs
-                    
-                    if new_dirs and not log_dir_found:
-                        print(f"  [{i+1}] {current_time} - 🎯 log_SmartCheck created new directory")
-                        log_dir_found = True
-                        initial_log_dirs = current_log_dirs
+                # Check log_SmartCheck directory (no rescans once found)
+                if not log_dir_found:
+                    log_mtime = _mtime_ns(log_base_dir)
+                    if log_mtime != prev_log_mtime:
+                        prev_log_mtime = log_mtime
+                        new_dir = _first_new_subdir(log_base_dir, initial_log_dirs)
+                        if new_dir:
+                            print(f"  [{i+1}] {current_time} - 🎯 log_SmartCheck created new directory")
+                            log_dir_found = True
+                            # The new directory is the timestamp directory
+                            latest_log_dir = log_base_dir / new_dir
                 
-                # Find timestamp subdirectory
+                # Report timestamp subdirectory
                 if log_dir_found:
-                    latest_log_dir = self.find_latest_smartcheck_log_dir(smiwintools_dir)
                     if latest_log_dir:
                         print(f"  [{i+1}] {current_time} - 📁 Found log directory: {latest_log_dir.name}")
                         
-                        # Read RunCard.ini (status file)
+                        # Read RunCard.ini (status file); None if not written yet
                         runcard_ini = latest_log_dir / "RunCard.ini"
-                        if runcard_ini.exists():
-                            status = self.read_runcard_ini(runcard_ini)
-                            if status:
-                                print(f"       ✅ RunCard.ini contents:")
-                                for key, value in status.items():
-                                    print(f"          {key}: {value}")
-                                
-                                # If not ONGOING, test is complete
-                                test_result = status.get('test_result', '').upper()
-                                if test_result not in ['ONGOING', '']:
-                                    print(f"  [{i+1}] {current_time} - ✅ Test complete ({test_result})")
-                                    break
+                        status = self.read_runcard_ini(runcard_ini)
+                        if status:
+                            print(f"       ✅ RunCard.ini contents:")
+                            for key, value in status.items():
+                                print(f"          {key}: {value}")
+                            
+                            # If not ONGOING, test is complete
+                            test_result = status.get('test_result', '').upper()
+                            if test_result not in ['ONGOING', '']:
+                                print(f"  [{i+1}] {current_time} - ✅ Test complete ({test_result})")
+                                break
                         break
                 else:
                     print(f"  [{i+1}] {current_time} - Waiting for log_SmartCheck directory...")
@@ -249,12 +326,14 @@ class TestDirectSmartCheckBat:
                 
                 # List all files
                 print(f"\n  Generated files:")
-                for file in sorted(latest_log_dir.iterdir()):
-                    if file.is_file():
-                        size = file.stat().st_size
-                        print(f"    - {file.name} ({size} bytes)")
-                    else:
-                        print(f"    - {file.name}/ (directory)")
+                # On Windows scandir entries carry the size, so no per-file stat()
+                with os.scandir(latest_log_dir) as it:
+                    entries = sorted(it, key=lambda e: e.name)
+                for entry in entries:
+                    if entry.is_file(follow_symlinks=False):
+                        print(f"    - {entry.name} ({entry.stat().st_size} bytes)")
+                    elif entry.is_dir(follow_symlinks=False):
+                        print(f"    - {entry.name}/ (directory)")
                 
                 # Read RunCard.ini (status file - small file)
                 runcard_ini = latest_log_dir / "RunCard.ini"
@@ -331,9 +410,11 @@ class TestDirectSmartCheckBat:
         
         try:
             process = subprocess.Popen(
-                str(smartcheck_bat),
-                creationflags=subprocess.CREATE_NEW_CONSOLE,
-                cwd=str(smiwintools_dir)
+                os.fspath(smartcheck_bat),
+                creationflags=_CREATIONFLAGS,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+                cwd=os.fspath(smiwintools_dir)
             )
             
             # Wait enough time for directory creation
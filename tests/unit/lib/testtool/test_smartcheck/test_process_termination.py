@@ -6,63 +6,69 @@ This script specifically tests that:
 2. No orphaned processes remain after stop_smartcheck_bat()
 """
 
+import psutil
 import pytest
 import time
 import subprocess
 from pathlib import Path
 
-import sys
-sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent.parent))
-
 from lib.testtool.smartcheck import SmartCheckController
+from tests.unit.lib.testtool.test_smartcheck._helpers import backoff
+
+_SMIWINTOOLS_DIR = Path(__file__).resolve().parent.parent / "bin" / "SmiWinTools"
 
 
 def get_process_tree(pid):
     """
-    Get all child processes of a given PID.
+    Get all descendant processes of a given PID.
     
     Returns list of (pid, name) tuples.
     """
     try:
-        result = subprocess.run(
-            ['wmic', 'process', 'where', f'ParentProcessId={pid}', 
-             'get', 'ProcessId,Name'],
-            capture_output=True,
-            timeout=5,
-            text=True
-        )
-        
-        processes = []
-        for line in result.stdout.split('\n')[1:]:  # Skip header
-            line = line.strip()
-            if line:
-                parts = line.split()
-                if len(parts) >= 2:
-                    try:
-                        child_pid = int(parts[-1])
-                        name = ' '.join(parts[:-1])
-                        processes.append((child_pid, name))
-                    except ValueError:
-                        pass
-        
-        return processes
-    except Exception as e:
+        children = psutil.Process(pid).children(recursive=True)
+    except psutil.Error as e:
         print(f"Error getting process tree: {e}")
         return []
+    
+    processes = []
+    for child in children:
+        try:
+            processes.append((child.pid, child.name()))
+        except psutil.Error:
+            pass  # exited while we were listing it
+    return processes
 
 
 def process_exists(pid):
     """Check if a process with given PID exists."""
-    try:
-        result = subprocess.run(
-            ['tasklist', '/FI', f'PID eq {pid}'],
-            capture_output=True,
-            timeout=2,
-            text=True
-        )
-        return str(pid) in result.stdout
-    except Exception:
-        return False
+    return psutil.pid_exists(pid)
+
+
+def as_processes(pids):
+    """
+    Return psutil.Process handles for those of pids that are running now.
+    
+    Take these before stopping SmartCheck so a PID reused afterwards is not
+    mistaken for a survivor.
+    """
+    procs = []
+    for pid in pids:
+        try:
+            procs.append(psutil.Process(pid))
+        except psutil.NoSuchProcess:
+            pass
+    return procs
+
+
+def wait_for_exit(procs, timeout):
+    """
+    Wait up to timeout seconds for all of procs to exit.
+    
+    Blocks in psutil.wait_procs rather than polling. Returns the set of
+    PIDs still running when it gives up (empty if they all exited).
+    """
+    _, alive = psutil.wait_procs(procs, timeout=timeout)
+    return {proc.pid for proc in alive}
 
 
 @pytest.mark.real_bat
@@ -70,31 +76,21 @@ class TestProcessTermination:
     """Test process termination functionality."""
     
     @pytest.fixture
-    def real_paths(self):
+    def real_paths(self, tmp_path):
         """Get real SmartCheck.bat paths."""
-        base_path = Path(__file__).parent.parent / "bin" / "SmiWinTools"
+        base_path = _SMIWINTOOLS_DIR
         bat_path = base_path / "SmartCheck.bat"
         ini_path = base_path / "SmartCheck.ini"
-        output_dir = base_path / "test_termination_output"
-        
-        if not bat_path.exists():
-            pytest.skip(f"SmartCheck.bat not found at {bat_path}")
+        # Per-test output directory; pytest prunes old tmp_path trees itself
+        output_dir = tmp_path / "test_termination_output"
         
-        output_dir.mkdir(exist_ok=True)
+        output_dir.mkdir()
         
-        yield {
+        return {
             'bat_path': str(bat_path),
             'ini_path': str(ini_path),
             'output_dir': str(output_dir),
         }
-        
-        # Cleanup
-        import shutil
-        if output_dir.exists():
-            try:
-                shutil.rmtree(output_dir)
-            except Exception as e:
-                print(f"Cleanup warning: {e}")
     
     def test_process_termination_complete(self, real_paths):
         """
@@ -122,17 +118,24 @@ class TestProcessTermination:
         print("\n=== Starting SmartCheck ===")
         controller.start()
         
-        # Wait for process to fully start
-        time.sleep(5)
+        # Wait (up to 5 seconds) for the process and its children to start
+        deadline = time.monotonic() + 5
+        parent_pid = None
+        children_before = []
+        for delay in backoff():
+            if controller._process is not None:
+                parent_pid = controller._process.pid
+                children_before = get_process_tree(parent_pid)
+                if children_before:
+                    break
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            time.sleep(min(delay, remaining))
         
-        # Get the parent PID
-        parent_pid = controller._process.pid if controller._process else None
         assert parent_pid is not None, "Process should have been started"
         
         print(f"Parent PID: {parent_pid}")
-        
-        # Get child processes
-        children_before = get_process_tree(parent_pid)
         print(f"Child processes before stop: {children_before}")
         
         # Collect all PIDs to check
@@ -141,22 +144,21 @@ class TestProcessTermination:
         
         # Verify parent is running
         assert process_exists(parent_pid), f"Parent process {parent_pid} should be running"
+        procs = as_processes(all_pids)
         
         print("\n=== Stopping SmartCheck ===")
         controller.stop()
         
-        # Wait for termination to complete
+        # Wait for termination to complete (join wakes as soon as run() exits)
         controller.join(timeout=30)
         
-        # Wait a bit more for cleanup
-        time.sleep(2)
-        
         print("\n=== Verifying termination ===")
         
-        # Check if any processes still exist
+        # Give the tree up to 2 seconds to finish exiting
+        alive = wait_for_exit(procs, timeout=2)
         surviving_processes = []
         for pid in all_pids:
-            if process_exists(pid):
+            if pid in alive:
                 surviving_processes.append(pid)
                 print(f"WARNING: Process {pid} still exists!")
             else:
@@ -205,14 +207,13 @@ class TestProcessTermination:
         
         parent_pid = controller._process.pid if controller._process else None
         print(f"Parent PID: {parent_pid}")
+        procs = as_processes([parent_pid]) if parent_pid else []
         
         controller.stop()
         controller.join(timeout=30)
         
-        # Verify termination
-        time.sleep(1)
-        
-        if parent_pid and process_exists(parent_pid):
+        # Verify termination (allow up to 1 second to finish exiting)
+        if wait_for_exit(procs, timeout=1):
             print(f"❌ Parent process {parent_pid} still exists")
             assert False, "Process should be terminated"
         else:
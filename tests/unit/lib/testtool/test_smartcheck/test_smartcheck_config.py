@@ -8,15 +8,170 @@ This test verifies:
 3. Whether RunCard.ini is created in the specified output_dir
 """
 
+import contextlib
 import pytest
 import subprocess
 import os
 import time
 from pathlib import Path
 from datetime import datetime
-import configparser
 import shutil
 
+from lib.testtool.smartcheck.controller import _KV_RE, _SECTION_RE
+from tests.unit.lib.testtool.test_smartcheck._helpers import backoff
+
+try:
+    import win32api
+    import win32con
+    import win32event
+    import win32file
+    _PYWIN32_AVAILABLE = True
+except ImportError:
+    _PYWIN32_AVAILABLE = False
+
+_HERE = Path(__file__).resolve().parent
+_SMIWINTOOLS_DIR = _HERE.parent / "bin" / "SmiWinTools"
+
+# SmartCheck.ini and RunCard.ini are flat "[section]" + "key = value" files,
+# so a line scan with the controller's _SECTION_RE/_KV_RE patterns replaces
+# ConfigParser for the few keys these tests read or change.
+
+
+def _read_ini_section(path, section):
+    """
+    Return {lower-cased key: value} of one section of the INI at path,
+    or None if the section is absent
+
+    Stops at the next section header instead of parsing the whole file.
+    """
+    values = None
+    with open(path, encoding='utf-8', errors='replace') as f:
+        for line in f:
+            header = _SECTION_RE.match(line)
+            if header:
+                if values is not None:
+                    break
+                if header.group(1).strip() == section:
+                    values = {}
+            elif values is not None:
+                kv = _KV_RE.match(line)
+                if kv:
+                    values[kv.group(1).lower()] = kv.group(2)
+    return values
+
+
+def _tree_stamp(path):
+    """
+    Return the mtimes of path and of each directory directly under it, or
+    None if path does not exist
+
+    Creating a run's timestamp directory changes path's mtime and writing
+    RunCard.ini into it changes that directory's mtime, so an unchanged
+    stamp means a RunCard.ini scan of path would find nothing new. Only
+    one directory listing is needed (DirEntry.stat() is served from it on
+    Windows).
+    """
+    try:
+        with os.scandir(path) as it:
+            subdirs = sorted(
+                (entry.name, entry.stat(follow_symlinks=False).st_mtime_ns)
+                for entry in it if entry.is_dir(follow_symlinks=False)
+            )
+        return os.stat(path).st_mtime_ns, subdirs
+    except FileNotFoundError:
+        return None
+
+
+class _ChangeWaiter:
+    """
+    Sleep that ends early when a watched directory tree changes or the
+    watched process exits
+
+    Uses Windows change notifications through pywin32 and waits on them
+    together with the process handle, so a RunCard.ini created right after
+    a check, or SmartCheck.bat ending, is seen at once instead of after
+    the next full interval. Without pywin32 ``wait`` still returns as soon
+    as the process exits (Popen.wait blocks on the process handle on
+    Windows); only directory changes go back to being polled.
+    """
+    
+    def __init__(self, dirs, process):
+        self._process = process
+        self._notify = []
+        self._process_handle = None
+        if not _PYWIN32_AVAILABLE:
+            return
+        change_filter = (win32con.FILE_NOTIFY_CHANGE_FILE_NAME
+                         | win32con.FILE_NOTIFY_CHANGE_DIR_NAME)
+        try:
+            for path in dirs:
+                self._notify.append(
+                    win32file.FindFirstChangeNotification(os.fspath(path), True, change_filter)
+                )
+            self._process_handle = win32api.OpenProcess(
+                win32con.SYNCHRONIZE, False, process.pid
+            )
+        except BaseException:
+            # The caller never gets an object to close(); release what was
+            # opened before the failing call
+            self.close()
+            raise
+    
+    def wait(self, timeout):
+        """Block for up to timeout seconds, or until something changes."""
+        if self._process_handle is None:
+            try:
+                self._process.wait(timeout)
+            except subprocess.TimeoutExpired:
+                pass
+            return
+        rc = win32event.WaitForMultipleObjects(
+            self._notify + [self._process_handle], False, int(timeout * 1000)
+        )
+        index = rc - win32event.WAIT_OBJECT_0
+        if 0 <= index < len(self._notify):
+            # Re-arm the signalled notification for the next wait
+            win32file.FindNextChangeNotification(self._notify[index])
+    
+    def close(self):
+        for handle in self._notify:
+            win32file.FindCloseChangeNotification(handle)
+        self._notify = []
+        if self._process_handle is not None:
+            self._process_handle.Close()
+            self._process_handle = None
+
+
+@contextlib.contextmanager
+def _launch_smartcheck(smartcheck_bat, smiwintools_dir):
+    """
+    Run SmartCheck.bat from its own directory for the duration of a block
+
+    Yields the Popen object. On exit, including a failed assertion, a
+    still-running process is terminated and given 2 seconds to exit
+    (Popen.wait blocks on the process rather than sleeping) before it is
+    killed, and the previous working directory is restored.
+    """
+    original_dir = os.getcwd()
+    os.chdir(smiwintools_dir)
+    try:
+        process = subprocess.Popen(
+            os.fspath(smartcheck_bat),
+            creationflags=subprocess.CREATE_NEW_CONSOLE,
+            cwd=os.fspath(smiwintools_dir)
+        )
+        try:
+            yield process
+        finally:
+            if process.poll() is None:
+                process.terminate()
+                try:
+                    process.wait(timeout=2)
+                except subprocess.TimeoutExpired:
+                    process.kill()
+    finally:
+        os.chdir(original_dir)
+
 
 class TestSmartCheckConfig:
     """Verify SmartCheck.ini configuration features"""
@@ -24,7 +179,7 @@ class TestSmartCheckConfig:
     @pytest.fixture
     def smiwintools_dir(self):
         """Directory containing SmartCheck.bat"""
-        return Path(__file__).resolve().parent.parent / "bin" / "SmiWinTools"
+        return _SMIWINTOOLS_DIR
     
     @pytest.fixture
     def smartcheck_bat(self, smiwintools_dir):
@@ -60,57 +215,105 @@ class TestSmartCheckConfig:
             smartcheck_ini_path: path to SmartCheck.ini
             output_dir: output directory to set (absolute path)
         """
-        config = configparser.ConfigParser()
-        config.read(smartcheck_ini_path)
+        ini_path = Path(smartcheck_ini_path)
+        lines = ini_path.read_text(encoding='utf-8').splitlines(keepends=True)
+        new_line = f"output_dir = {output_dir}\n"
         
-        # Modify output_dir
-        if 'global' in config:
-            config['global']['output_dir'] = str(output_dir)
-            
-            # Write back to file
-            with open(smartcheck_ini_path, 'w') as f:
-                config.write(f)
-            
-            return True
-        return False
+        # Rewrite only the output_dir line of [global], keeping comments and
+        # key order; add the key at the end of the section if it is missing
+        in_global = False
+        replaced = False
+        insert_at = None
+        for i, line in enumerate(lines):
+            header = _SECTION_RE.match(line)
+            if header:
+                if in_global:
+                    break
+                in_global = header.group(1).strip() == 'global'
+                if in_global:
+                    insert_at = i + 1
+            elif in_global:
+                kv = _KV_RE.match(line)
+                if kv and kv.group(1).lower() == 'output_dir':
+                    lines[i] = new_line
+                    replaced = True
+                    break
+                if line.strip():
+                    insert_at = i + 1
+        
+        if insert_at is None:
+            return False
+        if not replaced:
+            if not lines[insert_at - 1].endswith('\n'):
+                lines[insert_at - 1] += '\n'
+            lines.insert(insert_at, new_line)
+        
+        # Write back to file
+        ini_path.write_text(''.join(lines), encoding='utf-8')
+        return True
     
     def read_smartcheck_ini_output_dir(self, smartcheck_ini_path):
         """Read the output_dir setting from SmartCheck.ini"""
-        config = configparser.ConfigParser()
-        config.read(smartcheck_ini_path)
-        
-        if 'global' in config:
-            return config['global'].get('output_dir', '')
-        return ''
+        return (_read_ini_section(smartcheck_ini_path, 'global') or {}).get('output_dir', '')
     
-    def find_runcard_ini(self, search_dir, max_depth=3):
+    def iter_runcard_ini(self, search_dir, max_depth=3, visited=None):
         """
-        Search for RunCard.ini under the specified directory
+        Lazily yield RunCard.ini paths under the specified directory
+
+        Walks with os.scandir so file/dir checks use the cached DirEntry
+        type instead of a stat() per entry; symlinks are not followed.
 
         Args:
             search_dir: directory to start searching from
             max_depth: maximum recursion depth
+            visited: optional list; the path of every entry scanned is
+                appended to it
 
-        Returns:
-            list of found RunCard.ini paths
+        Yields:
+            Path of each RunCard.ini found
         """
-        found_files = []
-        
-        def search_recursive(current_dir, depth):
-            if depth > max_depth:
-                return
-            
+        # Explicit stack instead of recursion: no frame per directory and
+        # no recursion limit on deep trees
+        stack = [(os.fspath(search_dir), 0)]
+        while stack:
+            current_dir, depth = stack.pop()
             try:
-                for item in current_dir.iterdir():
-                    if item.is_file() and item.name == "RunCard.ini":
-                        found_files.append(item)
-                    elif item.is_dir():
-                        search_recursive(item, depth + 1)
+                with os.scandir(current_dir) as it:
+                    for entry in it:
+                        if visited is not None:
+                            visited.append(entry.path)
+                        if entry.is_file(follow_symlinks=False):
+                            if entry.name == "RunCard.ini":
+                                yield Path(entry.path)
+                        elif entry.is_dir(follow_symlinks=False) and depth < max_depth:
+                            stack.append((entry.path, depth + 1))
             except PermissionError:
                 pass
-        
-        search_recursive(Path(search_dir), 0)
-        return found_files
+    
+    def find_runcard_ini(self, search_dir, max_depth=3, visited=None):
+        """
+        Search for RunCard.ini under the specified directory
+
+        Args:
+            search_dir: directory to start searching from
+            max_depth: maximum recursion depth
+            visited: optional list collecting every scanned entry path
+
+        Returns:
+            list of found RunCard.ini paths
+        """
+        return list(self.iter_runcard_ini(search_dir, max_depth, visited))
+    
+    def find_first_runcard_ini(self, search_dir, max_depth=3, visited=None):
+        """
+        Return the first RunCard.ini under the specified directory
+
+        Stops walking at the first match, for polls that only need one.
+
+        Returns:
+            Path of the RunCard.ini, or None if none exists yet
+        """
+        return next(self.iter_runcard_ini(search_dir, max_depth, visited), None)
     
     def test_output_dir_configuration(self, smartcheck_bat, smartcheck_ini, 
                                      smiwintools_dir, backup_smartcheck_ini):
@@ -131,7 +334,7 @@ class TestSmartCheckConfig:
             pytest.skip(f"SmartCheck.bat not found")
         
         # 1. Create custom output directory under test_smartcheck/
-        test_smartcheck_dir = Path(__file__).parent
+        test_smartcheck_dir = _HERE
         custom_output_dir = test_smartcheck_dir / "smartcheck_custom_output"
         
         # Clean up if exists
@@ -160,55 +363,69 @@ class TestSmartCheckConfig:
         print(f"\n[3] Run SmartCheck.bat:")
         print(f"  Start time: {datetime.now().strftime('%Y/%m/%d %H:%M:%S')}")
         
-        original_dir = os.getcwd()
-        os.chdir(smiwintools_dir)
-        
-        try:
-            process = subprocess.Popen(
-                str(smartcheck_bat),
-                creationflags=subprocess.CREATE_NEW_CONSOLE,
-                cwd=str(smiwintools_dir)
-            )
+        with _launch_smartcheck(smartcheck_bat, smiwintools_dir) as process:
             print(f"  Process PID: {process.pid}")
             
             # 4. Monitor output directory
             print(f"\n[4] Monitor output directory:")
 
-            # Wait up to 180 seconds (3 minutes)
+            # Wait up to 180 seconds (3 minutes); checks back off from 0.25 s
+            # to every 5 seconds, or run as soon as either output tree
+            # changes or the process exits
             monitor_duration = 180
-            check_interval = 5
+            delays = backoff(initial=0.25, cap=5.0)
             runcard_found = False
             runcard_location = None
+            default_log_dir = smiwintools_dir / "log_SmartCheck"
+            # Entries seen by the last full scan of custom_output_dir, kept
+            # for the "not found" listing so it need not walk the tree again
+            custom_listing = None
+            # _tree_stamp of log_SmartCheck at its last scan
+            default_stamp = None
             
-            for i in range(int(monitor_duration / check_interval)):
-                time.sleep(check_interval)
-                current_time = datetime.now().strftime('%H:%M:%S')
-                
-                # Check process status
-                returncode = process.poll()
-                if returncode is not None:
-                    print(f"  [{i+1}] {current_time} - ⚠️ SmartCheck.bat ended")
-                    break
-                
-                # Search for RunCard.ini in custom directory
-                custom_runcards = self.find_runcard_ini(custom_output_dir)
-                if custom_runcards:
-                    print(f"  [{i+1}] {current_time} - 🎯 Found RunCard.ini in custom directory!")
-                    runcard_location = custom_runcards[0]
-                    runcard_found = True
-                    break
-                
-                # Also check default directory (log_SmartCheck)
-                default_log_dir = smiwintools_dir / "log_SmartCheck"
-                if default_log_dir.exists():
-                    default_runcards = self.find_runcard_ini(default_log_dir, max_depth=2)
-                    if default_runcards:
-                        print(f"  [{i+1}] {current_time} - ⚠️ Found RunCard.ini in default directory (output_dir setting ignored!)")
-                        runcard_location = default_runcards[0]
+            # log_SmartCheck may not exist yet, so watch SmiWinTools itself
+            waiter = _ChangeWaiter([custom_output_dir, smiwintools_dir], process)
+            deadline = time.monotonic() + monitor_duration
+            i = 0
+            try:
+                while (remaining := deadline - time.monotonic()) > 0:
+                    waiter.wait(min(next(delays), remaining))
+                    current_time = datetime.now().strftime('%H:%M:%S')
+                    
+                    # Check process status
+                    returncode = process.poll()
+                    if returncode is not None:
+                        print(f"  [{i+1}] {current_time} - ⚠️ SmartCheck.bat ended")
+                        break
+                    
+                    # Search for RunCard.ini in custom directory
+                    custom_listing = []
+                    runcard_location = self.find_first_runcard_ini(
+                        custom_output_dir, visited=custom_listing
+                    )
+                    if runcard_location:
+                        print(f"  [{i+1}] {current_time} - 🎯 Found RunCard.ini in custom directory!")
                         runcard_found = True
                         break
-                
-                print(f"  [{i+1}] {current_time} - Waiting for RunCard.ini to be created...")
+                    
+                    # Also check default directory (log_SmartCheck), but only
+                    # rescan it once it exists and has changed since the last
+                    # scan; the stamp is taken first so no update is missed
+                    stamp = _tree_stamp(default_log_dir)
+                    if stamp is not None and stamp != default_stamp:
+                        default_stamp = stamp
+                        runcard_location = self.find_first_runcard_ini(
+                            default_log_dir, max_depth=2
+                        )
+                        if runcard_location:
+                            print(f"  [{i+1}] {current_time} - ⚠️ Found RunCard.ini in default directory (output_dir setting ignored!)")
+                            runcard_found = True
+                            break
+                    
+                    print(f"  [{i+1}] {current_time} - Waiting for RunCard.ini to be created...")
+                    i += 1
+            finally:
+                waiter.close()
             
             # 5. Result verification
             print(f"\n[5] Result verification:")
@@ -224,11 +441,10 @@ class TestSmartCheckConfig:
                     print(f"  Relative path: {relative_to_custom}")
                     
                     # Read contents
-                    config = configparser.ConfigParser()
-                    config.read(runcard_location)
-                    if 'Test Status' in config:
+                    status = _read_ini_section(runcard_location, 'Test Status')
+                    if status is not None:
                         print(f"\n  RunCard.ini contents:")
-                        for key, value in config['Test Status'].items():
+                        for key, value in status.items():
                             print(f"    {key}: {value}")
                     
                 except ValueError:
@@ -240,23 +456,19 @@ class TestSmartCheckConfig:
                 
                 # List directory contents for debugging
                 print(f"\n  Custom directory contents:")
-                if custom_output_dir.exists():
-                    for item in custom_output_dir.rglob("*"):
-                        print(f"    {item.relative_to(custom_output_dir)}")
+                if custom_listing is None and custom_output_dir.exists():
+                    # Process ended before the first poll reached the scan
+                    custom_listing = []
+                    self.find_runcard_ini(custom_output_dir, visited=custom_listing)
+                for item in custom_listing or ():
+                    print(f"    {os.path.relpath(item, custom_output_dir)}")
                 
                 pytest.fail("SmartCheck.bat did not produce RunCard.ini after run")
             
-            # Cleanup process
+            # Cleanup process (terminated when the with block exits)
             if process.poll() is None:
                 print(f"\n[6] Cleanup:")
                 print(f"  Terminating process...")
-                process.terminate()
-                time.sleep(2)
-                if process.poll() is None:
-                    process.kill()
-            
-        finally:
-            os.chdir(original_dir)
         
         print("\n" + "="*80)
     
@@ -277,7 +489,7 @@ class TestSmartCheckConfig:
             pytest.skip(f"SmartCheck.bat not found")
         
         # Use test directory under test_smartcheck/
-        test_smartcheck_dir = Path(__file__).parent
+        test_smartcheck_dir = _HERE
         test_output_dir = test_smartcheck_dir / "smartcheck_absolute_output"
 
         # Clean up old directory
@@ -297,20 +509,22 @@ class TestSmartCheckConfig:
         configured_dir = self.read_smartcheck_ini_output_dir(smartcheck_ini)
         print(f"  Configured output_dir: {configured_dir}")
         
-        print(f"\n[2] Start SmartCheck.bat and wait 30 seconds...")
-        
-        original_dir = os.getcwd()
-        os.chdir(smiwintools_dir)
+        print(f"\n[2] Start SmartCheck.bat and wait up to 30 seconds...")
         
-        try:
-            process = subprocess.Popen(
-                str(smartcheck_bat),
-                creationflags=subprocess.CREATE_NEW_CONSOLE,
-                cwd=str(smiwintools_dir)
-            )
-            
-            # Wait 30 seconds to observe
-            time.sleep(30)
+        with _launch_smartcheck(smartcheck_bat, smiwintools_dir) as process:
+            # Observe for up to 30 seconds, stopping early once RunCard.ini
+            # shows up in the configured directory or the process ends
+            waiter = _ChangeWaiter([test_output_dir], process)
+            deadline = time.monotonic() + 30
+            delays = backoff(initial=0.25, cap=5.0)
+            try:
+                while (remaining := deadline - time.monotonic()) > 0:
+                    waiter.wait(min(next(delays), remaining))
+                    if (process.poll() is not None
+                            or self.find_first_runcard_ini(test_output_dir)):
+                        break
+            finally:
+                waiter.close()
 
             print(f"\n[3] Check output directory:")
 
@@ -334,15 +548,6 @@ class TestSmartCheckConfig:
                 default_runcards = self.find_runcard_ini(default_log, max_depth=2)
                 if default_runcards:
                     print(f"  ⚠️ Also found RunCard.ini in default location: {len(default_runcards)}")
-            
-            # Terminate process
-            process.terminate()
-            time.sleep(2)
-            if process.poll() is None:
-                process.kill()
-        
-        finally:
-            os.chdir(original_dir)
         
         print("="*80)
 
@@ -0,0 +1,35 @@
+"""
+Unit tests for the --ast pass of tools/convert_unittest_to_pytest.py.
+"""
+
+import pytest
+from tools.convert_unittest_to_pytest import _convert_multiline_asserts
+
+
+class TestConvertMultilineAsserts:
+    """Test suite for _convert_multiline_asserts."""
+
+    @pytest.mark.parametrize("comment", ["  # note", ""])
+    def test_non_ascii_last_argument(self, comment):
+        src = (
+            "class T:\n"
+            "    def test_x(self):\n"
+            "        self.assertEqual(\n"
+            "            foo(),\n"
+            f"            \"未找到\"){comment}\n"
+            "        x = 1\n"
+        )
+        assert _convert_multiline_asserts(src) == (
+            "class T:\n"
+            "    def test_x(self):\n"
+            f"        assert foo() == \"未找到\"{comment}\n"
+            "        x = 1\n"
+        )
+
+    def test_non_ascii_before_statement(self):
+        src = "x = '名'; y = 2\nself.assertTrue(\n    y)\n"
+        assert _convert_multiline_asserts(src) == "x = '名'; y = 2\nassert y\n"
+
+    def test_single_line_assert_left_to_line_pass(self):
+        src = "self.assertEqual(a, b)\n"
+        assert _convert_multiline_asserts(src) is src
@@ -2,6 +2,8 @@
 Test Burnin Import Verification
 Verify that the RunCard integration in test_burnin.py can be imported correctly
 """
+import contextlib
+import io
 import sys
 from pathlib import Path
 
@@ -9,16 +11,32 @@ from pathlib import Path
 project_root = Path(__file__).resolve().parents[2]
 sys.path.insert(0, str(project_root))
 
+# Built once from project_root instead of inside test_imports()
+_TEST_DIR = project_root / "tests/integration/client_pcie_lenovo_storagedv/stc1685_burnin"
+_SMICLI_PATH = _TEST_DIR / "bin/SmiWinTools/bin/x64/SmiCli2.exe"
+
 def test_imports():
-    """Test all imports"""
+    """
+    Test all imports
+
+    Output is collected in memory and written to stdout in one go at the
+    end, instead of one console write per print().
+    """
+    buf = io.StringIO()
+    try:
+        with contextlib.redirect_stdout(buf):
+            return _test_imports()
+    finally:
+        sys.stdout.write(buf.getvalue())
+        sys.stdout.flush()
+
+
+def _test_imports():
     print("=" * 60)
     print("Verifying imports for test_burnin.py")
     print("=" * 60)
     
     try:
-        # Switch to the test directory
-        test_dir = Path(__file__).parent.parent / "integration/client_pcie_lenovo_storagedv/stc1685_burnin"
-        
         # Test imports
         from lib.testtool import RunCard as RC
         print("✓ RunCard imported successfully")
@@ -51,9 +69,8 @@ def test_imports():
         
         # Check SmiCli path
         print("\nCheck SmiCli path:")
-        smicli_path = test_dir / "bin/SmiWinTools/bin/x64/SmiCli2.exe"
-        print(f"  Path: {smicli_path}")
-        print(f"  Exists: {smicli_path.exists()}")
+        print(f"  Path: {_SMICLI_PATH}")
+        print(f"  Exists: {_SMICLI_PATH.exists()}")
         
         print("\n" + "=" * 60)
         print("✓ All import checks passed!")
@@ -9,6 +9,14 @@ from pathlib import Path
 project_root = Path(__file__).resolve().parents[2]
 sys.path.insert(0, str(project_root))
 
+# Key RunCard module attributes and their descriptions
+_CLASSES_TO_CHECK = (
+    ('Runcard', 'RunCard main class'),
+    ('TestResult', 'Test result enum'),
+    ('DiskType', 'Disk type enum'),
+    ('RuncardFormat', 'RunCard format enum'),
+)
+
 def test_runcard_import():
     """Test RunCard import"""
     print("=" * 60)
@@ -22,15 +30,10 @@ def test_runcard_import():
         
         # Check that key classes exist
         print("\nChecking key classes:")
-        classes_to_check = [
-            ('Runcard', 'RunCard main class'),
-            ('TestResult', 'Test result enum'),
-            ('DiskType', 'Disk type enum'),
-            ('RuncardFormat', 'RunCard format enum'),
-        ]
-        
-        for class_name, desc in classes_to_check:
-            if hasattr(RC, class_name):
+        # Plain lookups in the module namespace instead of hasattr()
+        module_attrs = vars(RC)
+        for class_name, desc in _CLASSES_TO_CHECK:
+            if class_name in module_attrs:
                 print(f"  ✓ {class_name} - {desc}")
             else:
                 print(f"  ✗ {class_name} - 未找到")
@@ -2,10 +2,50 @@
 SmiCli Path Verification Script
 Verify availability of SmiCli2.exe at expected locations
 """
+import contextlib
+import io
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
 
+
+@lru_cache(maxsize=None)
+def _list_dir(parent):
+    """
+    Map normcase(entry name) -> os.DirEntry for one directory, scanned once
+    per process
+
+    Existence and size checks are answered from the listing, so they need
+    no extra stat() calls. Names are normcased so lookups stay
+    case-insensitive on Windows, like Path.exists(). A missing or unreadable
+    directory lists as empty.
+    """
+    try:
+        with os.scandir(parent) as it:
+            return {os.path.normcase(entry.name): entry for entry in it}
+    except OSError:
+        return {}
+
+
 def verify_smicli_paths():
-    """Verify SmiCli paths"""
+    """
+    Verify SmiCli paths
+
+    Output is collected in memory and written to stdout in one go at the
+    end, instead of one console write per print().
+    """
+    buf = io.StringIO()
+    try:
+        with contextlib.redirect_stdout(buf):
+            return _verify_smicli_paths()
+    finally:
+        sys.stdout.write(buf.getvalue())
+        sys.stdout.flush()
+
+
+def _verify_smicli_paths():
     print("=" * 60)
     print("SmiCli2.exe path verification")
     print("=" * 60)
@@ -33,6 +73,13 @@ def verify_smicli_paths():
         },
     ]
     
+    # Scan the candidate directories concurrently so a slow network share
+    # costs its own latency instead of adding to the others; the loop
+    # below then reads the cached listings in priority order
+    parents = {str(item['path'].parent) for item in smicli_paths}
+    with ThreadPoolExecutor(max_workers=len(parents)) as pool:
+        list(pool.map(_list_dir, parents))
+    
     found_paths = []
     
     print("\nPath check results:")
@@ -43,7 +90,8 @@ def verify_smicli_paths():
         name = item['name']
         path = item['path']
         
-        exists = path.exists()
+        entry = _list_dir(str(path.parent)).get(os.path.normcase(path.name))
+        exists = entry is not None
         status = "✓ Present" if exists else "✗ Missing"
         
         print(f"[Priority {priority}] {name}")
@@ -53,7 +101,7 @@ def verify_smicli_paths():
         if exists:
             found_paths.append(path)
             # Check file size
-            size_kb = path.stat().st_size / 1024
+            size_kb = entry.stat().st_size / 1024
             print(f"  Size: {size_kb:.2f} KB")
         
         print()
@@ -72,6 +120,5 @@ def verify_smicli_paths():
         return False
 
 if __name__ == "__main__":
-    import sys
     success = verify_smicli_paths()
     sys.exit(0 if success else 1)
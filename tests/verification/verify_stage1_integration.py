@@ -2,6 +2,11 @@
 Test Stage 1 Verification
 Verify that RunCard integration for stage 1 is correct
 """
+import contextlib
+import io
+import mmap
+import os
+import re
 import sys
 from pathlib import Path
 
@@ -9,8 +14,70 @@ from pathlib import Path
 project_root = Path(__file__).resolve().parents[2]
 sys.path.insert(0, str(project_root))
 
+# (marker, message if present, message if missing), in report order
+_PRESENCE_CHECKS = [
+    ("from lib.testtool import RunCard as RC",
+     "RunCard import present", "RunCard import missing"),
+    ("cls.runcard = RC.Runcard(",
+     "RunCard initialized in setup_test_class",
+     "RunCard initialization missing in setup_test_class"),
+    ("cls.runcard.start_test(",
+     "start_test() call present", "start_test() call missing"),
+    ("cls.runcard.end_test(RC.TestResult.PASS.value)",
+     "end_test() (PASS) call present", "end_test() (PASS) call missing"),
+    ("cls.runcard.end_test(RC.TestResult.FAIL.value",
+     "end_test() (FAIL) call present", "end_test() (FAIL) call missing"),
+    ("cls.test_passed = True",
+     "test_passed flag initialized", "test_passed flag missing"),
+    ("self.__class__.test_passed = False",
+     "set test_passed flag on failure", "missing failure flag set"),
+    ("bin/SmiWinTools/bin/x64/SmiCli2.exe",
+     "correct SmiCli path used", "incorrect SmiCli path"),
+]
+_TEST_05_DEF = "def test_05_burnin_smartcheck(self):"
+_TEST_06_DEF = "def test_06_cdi_after(self):"
+_RUNCARD_INIT = "runcard = RC.Runcard("
+
+_MARKERS = [marker for marker, _, _ in _PRESENCE_CHECKS] + [
+    _TEST_05_DEF, _TEST_06_DEF, _RUNCARD_INIT,
+]
+# One alternation inside a lookahead, so a single sweep reports every
+# marker, including ones that overlap (e.g. "cls.runcard = RC.Runcard(" also
+# contains "runcard = RC.Runcard("). Bytes pattern: the markers are ASCII
+# and the file is searched without decoding it.
+_MARKER_RE = re.compile(
+    b"(?=(" + b"|".join(re.escape(marker.encode()) for marker in _MARKERS) + b"))"
+)
+
+
+def _find_markers(content):
+    """
+    Return marker -> list of start offsets, from one pass over content
+    (bytes or any buffer, such as an mmap).
+    """
+    positions = {marker: [] for marker in _MARKERS}
+    for match in _MARKER_RE.finditer(content):
+        positions[match.group(1).decode()].append(match.start())
+    return positions
+
+
 def verify_integration():
-    """Verify RunCard integration"""
+    """
+    Verify RunCard integration
+
+    Output is collected in memory and written to stdout in one go at the
+    end, instead of one console write per print().
+    """
+    buf = io.StringIO()
+    try:
+        with contextlib.redirect_stdout(buf):
+            return _verify_integration()
+    finally:
+        sys.stdout.write(buf.getvalue())
+        sys.stdout.flush()
+
+
+def _verify_integration():
     print("=" * 70)
     print("Stage 1: RunCard integration verification")
     print("=" * 70)
@@ -19,67 +86,39 @@ def verify_integration():
     
     print(f"\nReading file: {test_file}")
     
-    with open(test_file, 'r', encoding='utf-8') as f:
-        content = f.read()
+    # Map the file instead of reading it: pages are loaded as the search
+    # reaches them and nothing is decoded. mmap rejects empty files.
+    with open(test_file, 'rb') as f:
+        content_size = os.fstat(f.fileno()).st_size
+        if content_size:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as content:
+                positions = _find_markers(content)
+        else:
+            positions = _find_markers(b"")
     
     checks = []
     
-    # Check 1: RunCard import
-    if "from lib.testtool import RunCard as RC" in content:
-        checks.append(("✓", "RunCard import present"))
-    else:
-        checks.append(("✗", "RunCard import missing"))
+    def check_present(marker, ok_message, missing_message):
+        if positions[marker]:
+            checks.append(("✓", ok_message))
+        else:
+            checks.append(("✗", missing_message))
     
-    # Check 2: RunCard initialized in setup_test_class
-    if "cls.runcard = RC.Runcard(" in content:
-        checks.append(("✓", "RunCard initialized in setup_test_class"))
-    else:
-        checks.append(("✗", "RunCard initialization missing in setup_test_class"))
-    
-    # Check 3: start_test call
-    if "cls.runcard.start_test(" in content:
-        checks.append(("✓", "start_test() call present"))
-    else:
-        checks.append(("✗", "start_test() call missing"))
-    
-    # Check 4: end_test call (PASS)
-    if "cls.runcard.end_test(RC.TestResult.PASS.value)" in content:
-        checks.append(("✓", "end_test() (PASS) call present"))
-    else:
-        checks.append(("✗", "end_test() (PASS) call missing"))
-    
-    if "cls.runcard.end_test(RC.TestResult.FAIL.value" in content:
-        checks.append(("✓", "end_test() (FAIL) call present"))
-    else:
-        checks.append(("✗", "end_test() (FAIL) call missing"))
-    
-    # Check 5: test_passed flag
-    if "cls.test_passed = True" in content:
-        checks.append(("✓", "test_passed flag initialized"))
-    else:
-        checks.append(("✗", "test_passed flag missing"))
-    
-    # Check 6: set flag on failure
-    if "self.__class__.test_passed = False" in content:
-        checks.append(("✓", "set test_passed flag on failure"))
-    else:
-        checks.append(("✗", "missing failure flag set"))
+    # Checks 1-6: each marker must appear somewhere in the file
+    for check in _PRESENCE_CHECKS[:-1]:
+        check_present(*check)
     
     # Check 7: RunCard initialization removed from test_05
-    test_05_start = content.find("def test_05_burnin_smartcheck(self):")
-    test_05_end = content.find("def test_06_cdi_after(self):")
-    test_05_content = content[test_05_start:test_05_end]
+    test_05_start = positions[_TEST_05_DEF][0] if positions[_TEST_05_DEF] else content_size
+    test_05_end = positions[_TEST_06_DEF][0] if positions[_TEST_06_DEF] else content_size
     
-    if "runcard = RC.Runcard(" not in test_05_content:
+    if not any(test_05_start <= pos < test_05_end for pos in positions[_RUNCARD_INIT]):
         checks.append(("✓", "RunCard initialization removed from test_05"))
     else:
         checks.append(("✗", "RunCard initialization still present in test_05"))
     
     # Check 8: SmiCli path
-    if "bin/SmiWinTools/bin/x64/SmiCli2.exe" in content:
-        checks.append(("✓", "correct SmiCli path used"))
-    else:
-        checks.append(("✗", "incorrect SmiCli path"))
+    check_present(*_PRESENCE_CHECKS[-1])
     
     # Display results
     print("\nVerification results:")
@@ -19,12 +19,53 @@ Handles:
 - with self.assertRaisesRegex(E, pat): -> with pytest.raises(E, match=pat):
 - Remove `if __name__ == '__main__': unittest.main()`
 - Add `import pytest` when needed
+- With --ast: also assert calls whose arguments span several lines
+
+Usage
+-----
+    python tools/convert_unittest_to_pytest.py [--dry-run] [--ast]
 """
+import ast
+import contextlib
+import hashlib
+import io
+import json
+import os
 import re
 import sys
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
 
+# ---------------------------------------------------------------------------
+# Precompiled patterns (_convert_line runs once per line of every file)
+# ---------------------------------------------------------------------------
+
+_RE_IMPORT_UNITTEST = re.compile(r'^import unittest\s*$')
+_RE_MAIN = re.compile(r"^if __name__ == ['\"]__main__['\"]:")
+_RE_WITH_RAISES = re.compile(r'^with self\.assertRaises\(')
+_RE_WITH_RAISES_REGEX = re.compile(r'^with self\.assertRaisesRegex\(')
+_RE_IMPORT_STMT = re.compile(r'^(import |from )')
+_RE_BODY_START = re.compile(r'^(def |class |async def |@)')
+
+# self.assertXxx(...) -> (minimum number of args, assert statement template)
+_ASSERT_TEMPLATES = {
+    'assertEqual': (2, 'assert {0} == {1}'),
+    'assertNotEqual': (2, 'assert {0} != {1}'),
+    'assertTrue': (1, 'assert {0}'),
+    'assertFalse': (1, 'assert not {0}'),
+    'assertIsNone': (1, 'assert {0} is None'),
+    'assertIsNotNone': (1, 'assert {0} is not None'),
+    'assertIsInstance': (2, 'assert isinstance({0}, {1})'),
+    'assertIn': (2, 'assert {0} in {1}'),
+    'assertNotIn': (2, 'assert {0} not in {1}'),
+}
+# One match tells whether a line is a convertible assert, and which one
+_ASSERT_DISPATCH = re.compile(
+    r'^self\.(' + '|'.join(_ASSERT_TEMPLATES) + r')\('
+)
+
+
 # ---------------------------------------------------------------------------
 # Balanced-paren argument extractor
 # ---------------------------------------------------------------------------
@@ -38,89 +79,102 @@ def _extract_call_args(text: str, start: int) -> tuple[list[str], int]:
     assert text[start] == '('
     depth = 1          # opening paren already consumed
     in_str = None
-    current: list[str] = []
-    args: list[str] = []
+    spans: list[tuple[int, int]] = []
+    arg_start = start + 1
     i = start + 1      # start AFTER the opening paren
 
+    # Only record where each argument starts and ends; the arguments are
+    # sliced out of text at the end instead of being built char by char
     while i < len(text):
         ch = text[i]
 
         if in_str:
-            current.append(ch)
             if ch == '\\':
                 i += 1
-                if i < len(text):
-                    current.append(text[i])
             elif ch == in_str:
                 in_str = None
         elif ch in ('"', "'"):
             in_str = ch
-            current.append(ch)
         elif ch in ('(', '[', '{'):
             depth += 1
-            current.append(ch)
         elif ch in (')', ']', '}'):
             depth -= 1
             if depth == 0:
-                args.append(''.join(current).strip())
-                return args, i + 1
-            current.append(ch)
+                spans.append((arg_start, i))
+                return [text[s:e].strip() for s, e in spans], i + 1
         elif ch == ',' and depth == 1:
-            args.append(''.join(current).strip())
-            current = []
-        else:
-            current.append(ch)
+            spans.append((arg_start, i))
+            arg_start = i + 1
 
         i += 1
 
-    return args, i
+    return [text[s:e].strip() for s, e in spans], i
 
 
 # ---------------------------------------------------------------------------
 # Line-level conversions
 # ---------------------------------------------------------------------------
 
+def _has_rule_token(text: str) -> bool:
+    """True if text contains a substring that some conversion rule needs."""
+    return ('self.assert' in text or 'unittest' in text or '__main__' in text
+            or 'def setUp' in text or 'def tearDown' in text)
+
+
 def _convert_line(line: str) -> tuple[str, bool]:
     """
     Convert one line. Returns (new_line, needs_pytest).
     new_line may be '' to signal 'delete this line'.
     """
+    # Cheap substring gate: every rule below needs one of these on the line
+    if not _has_rule_token(line):
+        return line, False
+
     needs_pytest = False
 
     raw_stripped = line.lstrip()
     indent = line[:len(line) - len(raw_stripped)]
-    stripped = raw_stripped.rstrip('\n').rstrip()
+    stripped = raw_stripped.rstrip()  # also strips the trailing newline
     nl = '\n' if line.endswith('\n') else ''
 
     # -----------------------------------------------------------------------
     # 1. Remove bare   import unittest
     # -----------------------------------------------------------------------
-    if re.match(r'^import unittest\s*$', stripped):
+    if _RE_IMPORT_UNITTEST.match(stripped):
         return '', False
 
     # -----------------------------------------------------------------------
     # 2. Remove unittest.main() block
     # -----------------------------------------------------------------------
-    if re.match(r"^if __name__ == ['\"]__main__['\"]:", stripped):
+    if _RE_MAIN.match(stripped):
         return '__SKIP_NEXT__', False
 
     # -----------------------------------------------------------------------
     # 3. class Foo(unittest.TestCase): -> class Foo:
     # -----------------------------------------------------------------------
-    line = re.sub(r'\(unittest\.TestCase\)', '', line)
-    stripped = line.lstrip().rstrip('\n').rstrip()
+    # Fixed literals: str.replace, and only when the needle is present.
+    # stripped is recomputed once below, and only if a rule rewrote line.
+    rewritten = False
+    if '(unittest.TestCase)' in line:
+        line = line.replace('(unittest.TestCase)', '')
+        rewritten = True
 
     # -----------------------------------------------------------------------
     # 4. setUp / tearDown
     # -----------------------------------------------------------------------
-    line = re.sub(r'\bdef setUp\(self\)', 'def setup_method(self)', line)
-    line = re.sub(r'\bdef tearDown\(self\)', 'def teardown_method(self)', line)
-    stripped = line.lstrip().rstrip('\n').rstrip()
+    if 'def setUp(self)' in line:
+        line = line.replace('def setUp(self)', 'def setup_method(self)')
+        rewritten = True
+    if 'def tearDown(self)' in line:
+        line = line.replace('def tearDown(self)', 'def teardown_method(self)')
+        rewritten = True
+    if rewritten:
+        stripped = line.strip()
 
     # -----------------------------------------------------------------------
     # 5. with self.assertRaises(E):
     # -----------------------------------------------------------------------
-    m = re.match(r'^with self\.assertRaises\(', stripped)
+    m = _RE_WITH_RAISES.match(stripped)
     if m:
         idx = stripped.index('(')
         args, end = _extract_call_args(stripped, idx)
@@ -131,7 +185,7 @@ def _convert_line(line: str) -> tuple[str, bool]:
     # -----------------------------------------------------------------------
     # 6. with self.assertRaisesRegex(E, pat):
     # -----------------------------------------------------------------------
-    m = re.match(r'^with self\.assertRaisesRegex\(', stripped)
+    m = _RE_WITH_RAISES_REGEX.match(stripped)
     if m:
         idx = stripped.index('(')
         args, end = _extract_call_args(stripped, idx)
@@ -141,84 +195,51 @@ def _convert_line(line: str) -> tuple[str, bool]:
         return f'{indent}with pytest.raises({exc}, match={pat}):{nl}', True
 
     # -----------------------------------------------------------------------
-    # Helper: extract the full self.assertXxx(...) from stripped
-    # -----------------------------------------------------------------------
-    def _get_assert_args(method: str):
-        pat = rf'^self\.{method}\('
-        if not re.match(pat, stripped):
-            return None
-        idx = stripped.index('(')
-        args, _ = _extract_call_args(stripped, idx)
-        return args
-
-    # -----------------------------------------------------------------------
-    # 7. self.assertEqual(a, b)
-    # -----------------------------------------------------------------------
-    args = _get_assert_args('assertEqual')
-    if args and len(args) >= 2:
-        return f'{indent}assert {args[0]} == {args[1]}{nl}', False
-
-    # -----------------------------------------------------------------------
-    # 8. self.assertNotEqual(a, b)
-    # -----------------------------------------------------------------------
-    args = _get_assert_args('assertNotEqual')
-    if args and len(args) >= 2:
-        return f'{indent}assert {args[0]} != {args[1]}{nl}', False
-
-    # -----------------------------------------------------------------------
-    # 9. self.assertTrue(x)
-    # -----------------------------------------------------------------------
-    args = _get_assert_args('assertTrue')
-    if args and len(args) >= 1:
-        return f'{indent}assert {args[0]}{nl}', False
-
-    # -----------------------------------------------------------------------
-    # 10. self.assertFalse(x)
-    # -----------------------------------------------------------------------
-    args = _get_assert_args('assertFalse')
-    if args and len(args) >= 1:
-        return f'{indent}assert not {args[0]}{nl}', False
-
-    # -----------------------------------------------------------------------
-    # 11. self.assertIsNone(x)
-    # -----------------------------------------------------------------------
-    args = _get_assert_args('assertIsNone')
-    if args and len(args) >= 1:
-        return f'{indent}assert {args[0]} is None{nl}', False
-
-    # -----------------------------------------------------------------------
-    # 12. self.assertIsNotNone(x)
+    # 7-15. self.assertEqual(a, b), assertTrue(x), ... -> assert statements
     # -----------------------------------------------------------------------
-    args = _get_assert_args('assertIsNotNone')
-    if args and len(args) >= 1:
-        return f'{indent}assert {args[0]} is not None{nl}', False
+    m = _ASSERT_DISPATCH.match(stripped)
+    if m:
+        min_args, template = _ASSERT_TEMPLATES[m.group(1)]
+        args, _ = _extract_call_args(stripped, m.end() - 1)
+        if len(args) >= min_args:
+            return f'{indent}{template.format(*args)}{nl}', False
 
-    # -----------------------------------------------------------------------
-    # 13. self.assertIsInstance(x, T)
-    # -----------------------------------------------------------------------
-    args = _get_assert_args('assertIsInstance')
-    if args and len(args) >= 2:
-        return f'{indent}assert isinstance({args[0]}, {args[1]}){nl}', False
+    return line, False
 
-    # -----------------------------------------------------------------------
-    # 14. self.assertIn(a, b)
-    # -----------------------------------------------------------------------
-    args = _get_assert_args('assertIn')
-    if args and len(args) >= 2:
-        return f'{indent}assert {args[0]} in {args[1]}{nl}', False
 
-    # -----------------------------------------------------------------------
-    # 15. self.assertNotIn(a, b)
-    # -----------------------------------------------------------------------
-    args = _get_assert_args('assertNotIn')
-    if args and len(args) >= 2:
-        return f'{indent}assert {args[0]} not in {args[1]}{nl}', False
+def _paren_delta(text: str) -> int:
+    """
+    Net '(' minus ')' in one line of code, in a single pass.
 
-    return line, False
+    Parentheses inside string literals and after a '#' comment are not
+    counted. Lines without any parenthesis return 0 without a scan.
+    """
+    if '(' not in text and ')' not in text:
+        return 0
+    depth = 0
+    quote = ''
+    escaped = False
+    for ch in text:
+        if quote:
+            if escaped:
+                escaped = False
+            elif ch == '\\':
+                escaped = True
+            elif ch == quote:
+                quote = ''
+        elif ch == '(':
+            depth += 1
+        elif ch == ')':
+            depth -= 1
+        elif ch in '\'"':
+            quote = ch
+        elif ch == '#':
+            break
+    return depth
 
 
-def _insert_pytest_import(lines: list[str]) -> list[str]:
-    """Insert 'import pytest' after the last top-level import block.
+class _ImportBlockTracker:
+    """Track where 'import pytest' goes: after the last top-level import block.
 
     Handles multi-line imports like:
         from foo import (
@@ -226,71 +247,222 @@ def _insert_pytest_import(lines: list[str]) -> list[str]:
             B,
         )
     by tracking open parentheses and only marking end after the closing ')'.
+    Lines are fed one at a time together with the position just past them,
+    so the same tracker works on list indices and on buffer offsets.
+
+    The first top-level def, class or decorator ends the import section;
+    later lines are ignored without being scanned.
     """
-    last_import_end = -1
-    in_multiline = False
-    paren_depth = 0
-
-    for i, ln in enumerate(lines):
-        stripped = ln.rstrip()
-        if in_multiline:
-            paren_depth += stripped.count('(') - stripped.count(')')
-            if paren_depth <= 0:
-                in_multiline = False
-                last_import_end = i
-        elif re.match(r'^(import |from )', ln):
-            if stripped.endswith('(') or stripped.count('(') > stripped.count(')'):
-                in_multiline = True
-                paren_depth = stripped.count('(') - stripped.count(')')
-            else:
-                last_import_end = i
 
-    insert_at = last_import_end + 1 if last_import_end >= 0 else 0
-    lines.insert(insert_at, 'import pytest\n')
-    return lines
+    def __init__(self) -> None:
+        self.insert_at = 0
+        self._paren_depth = 0
+        self._done = False
+
+    def feed(self, ln: str, end: int) -> None:
+        if self._done:
+            return
+        if self._paren_depth > 0:
+            self._paren_depth += _paren_delta(ln)
+            if self._paren_depth <= 0:
+                self.insert_at = end
+        elif _RE_IMPORT_STMT.match(ln):
+            self._paren_depth = _paren_delta(ln)
+            if self._paren_depth <= 0:
+                self.insert_at = end
+        elif _RE_BODY_START.match(ln):
+            self._done = True
 
 
-def convert_file(filepath: Path, dry_run: bool = False) -> bool:
-    content = filepath.read_text(encoding='utf-8')
-    raw_lines = content.splitlines(keepends=True)
+# ---------------------------------------------------------------------------
+# Multi-line asserts (--ast)
+# ---------------------------------------------------------------------------
 
-    output: list[str] = []
+def _convert_multiline_asserts(content: str) -> str:
+    """
+    Rewrite self.assertXxx(...) statements that span several lines.
+
+    The line pass only sees one line at a time, so these are left as they
+    are there. Here the file is parsed once with ast; each such call is
+    replaced by its assert statement, with the argument source taken
+    verbatim from the file and parenthesised if it still spans lines.
+    Everything outside those calls, comments included, is kept as is.
+    Returns content unchanged if it does not parse.
+    """
+    if content.startswith('\ufeff'):
+        # ast.parse rejects a BOM in str input; convert the text after it
+        body = content[1:]
+        converted = _convert_multiline_asserts(body)
+        return content if converted is body else '\ufeff' + converted
+    try:
+        tree = ast.parse(content)
+    except SyntaxError:
+        return content
+
+    # Split only where ast counts line breaks (str.splitlines also splits
+    # on \f, \u2028 and others)
+    lines = io.StringIO(content, newline='').readlines()
+    edits = []
+    for node in ast.walk(tree):
+        if not (isinstance(node, ast.Expr) and node.end_lineno > node.lineno):
+            continue
+        call = node.value
+        if not (
+            isinstance(call, ast.Call)
+            and isinstance(call.func, ast.Attribute)
+            and isinstance(call.func.value, ast.Name)
+            and call.func.value.id == 'self'
+            and call.func.attr in _ASSERT_TEMPLATES
+            and not call.keywords
+            and not any(isinstance(a, ast.Starred) for a in call.args)
+        ):
+            continue
+        min_args, template = _ASSERT_TEMPLATES[call.func.attr]
+        # ast column offsets count UTF-8 bytes, not characters
+        first = lines[node.lineno - 1].encode('utf-8')
+        indent = first[:node.col_offset].decode('utf-8')
+        if len(call.args) < min_args or indent.strip():
+            continue  # too few args, or not the first statement on its line
+        args = []
+        for arg in call.args[:min_args]:
+            src = ast.get_source_segment(content, arg)
+            args.append(f'({src})' if '\n' in src else src)
+        edits.append((node, indent + template.format(*args)))
+
+    if not edits:
+        return content
+
+    # Splice from the bottom up so earlier line numbers stay valid
+    edits.sort(key=lambda e: e[0].lineno, reverse=True)
+    for node, stmt in edits:
+        last = lines[node.end_lineno - 1].encode('utf-8')
+        tail = last[node.end_col_offset:].decode('utf-8')
+        lines[node.lineno - 1:node.end_lineno] = [stmt + tail]
+    return ''.join(lines)
+
+
+def _cache_key(filepath: Path, use_ast: bool) -> str:
+    # --ast can convert more than the line pass, so cache the modes apart
+    return f'{filepath}:ast' if use_ast else str(filepath)
+
+
+def _sha256(text: str) -> str:
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+def _tool_hash() -> str:
+    """Hash of this script, so a change to any rule invalidates the cache."""
+    return _sha256(Path(__file__).read_text(encoding='utf-8'))
+
+
+def _load_cache(path: Path) -> dict[str, str]:
+    """
+    Load the {file path: sha256 of its converted content} cache.
+
+    Returns an empty cache if the file is missing or corrupt, or was
+    written by a different version of this script.
+    """
+    try:
+        data = json.loads(path.read_text(encoding='utf-8'))
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(data, dict) or data.get('tool') != _tool_hash():
+        return {}
+    files = data.get('files')
+    return files if isinstance(files, dict) else {}
+
+
+def _save_cache(path: Path, cache: dict[str, str]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    data = {'tool': _tool_hash(), 'files': cache}
+    path.write_text(json.dumps(data, indent=2, sort_keys=True), encoding='utf-8')
+
+
+def convert_file(filepath: Path, dry_run: bool = False,
+                 cache: dict[str, str] | None = None,
+                 use_ast: bool = False) -> bool:
+    """
+    Convert one file in place. Returns True if it was (or, with dry_run,
+    would be) changed.
+
+    If cache is given, a file whose content hash matches its entry is
+    skipped, and the entry is updated to the hash of the file's content
+    after this run. use_ast adds a first pass for multi-line asserts
+    (see _convert_multiline_asserts).
+    """
+    # Convert line by line into one output buffer; no list of input lines,
+    # no list of output lines, and no full-content compare to detect
+    # "no change"
+    buf = io.StringIO()
+    imports = _ImportBlockTracker()
     needs_pytest = False
+    changed = False
     skip_next_indent = False
 
-    for i, line in enumerate(raw_lines):
-        if skip_next_indent:
-            # Skip the `    unittest.main()` line following the if-block
-            stripped_content = line.lstrip()
-            if stripped_content.startswith('unittest.main()'):
-                skip_next_indent = False
-                continue
-            # Not the expected line; stop skipping
-            skip_next_indent = False
+    content = filepath.read_text(encoding='utf-8')
+    key = _cache_key(filepath, use_ast)
+    content_hash = _sha256(content) if cache is not None else None
+    if content_hash is not None and cache.get(key) == content_hash:
+        # Already the output of a previous run
+        print(f'  [cached]    {filepath}')
+        return False
 
-        new_line, np = _convert_line(line)
-        if np:
-            needs_pytest = True
+    if not _has_rule_token(content):
+        # No line can match any rule; skip the per-line pass entirely
+        print(f'  [no change] {filepath}')
+        if content_hash is not None:
+            cache[key] = content_hash
+        return False
 
-        if new_line == '':
-            continue  # deleted line
-        elif new_line == '__SKIP_NEXT__':
-            skip_next_indent = True
-            continue
-        else:
-            output.append(new_line)
+    if use_ast:
+        converted = _convert_multiline_asserts(content)
+        changed = converted is not content
+        content = converted
+
+    with io.StringIO(content) as f:
+        for line in f:
+            if skip_next_indent:
+                # Skip the `    unittest.main()` line following the if-block
+                stripped_content = line.lstrip()
+                if stripped_content.startswith('unittest.main()'):
+                    skip_next_indent = False
+                    continue
+                # Not the expected line; stop skipping
+                skip_next_indent = False
 
-    if needs_pytest:
-        output = _insert_pytest_import(output)
+            new_line, np = _convert_line(line)
+            if np:
+                needs_pytest = True
+
+            if new_line == '':
+                changed = True
+                continue  # deleted line
+            elif new_line == '__SKIP_NEXT__':
+                changed = True
+                skip_next_indent = True
+                continue
+            else:
+                if new_line != line:
+                    changed = True
+                buf.write(new_line)
+                imports.feed(new_line, buf.tell())
 
-    new_content = ''.join(output)
-    if new_content == content:
+    if not changed and not needs_pytest:
         print(f'  [no change] {filepath}')
+        if content_hash is not None:
+            cache[key] = content_hash
         return False
 
+    new_content = buf.getvalue()
+    if needs_pytest:
+        at = imports.insert_at
+        new_content = f'{new_content[:at]}import pytest\n{new_content[at:]}'
+
     if not dry_run:
         filepath.write_text(new_content, encoding='utf-8')
         print(f'  [converted] {filepath}')
+        if cache is not None:
+            cache[key] = _sha256(new_content)
     else:
         print(f'  [dry-run]   {filepath}')
     return True
@@ -300,6 +472,9 @@ def convert_file(filepath: Path, dry_run: bool = False) -> bool:
 # Main
 # ---------------------------------------------------------------------------
 
+# Hashes of files as this tool last left them; see convert_file
+CACHE_FILE = '.cache/convert_unittest_to_pytest.json'
+
 TARGET_FILES = [
     'tests/unit/lib/testtool/test_phm/test_ui_monitor.py',
     'tests/unit/lib/testtool/test_phm/test_controller.py',
@@ -311,17 +486,52 @@ TARGET_FILES = [
     'tests/unit/lib/testtool/test_cdi/test_ui_monitor.py',
 ]
 
+
+def _convert_worker(
+    job: tuple[Path, bool, bool, dict[str, str]],
+) -> tuple[bool | None, str, dict[str, str]]:
+    """
+    Convert one file in a worker process.
+
+    job carries the file's own cache entry (if any). Returns (changed,
+    report, cache entry): changed is None for a missing file, and report
+    is what convert_file printed, so the parent can print reports in
+    TARGET_FILES order instead of interleaved.
+    """
+    fp, dry_run, use_ast, cache = job
+    if not fp.exists():
+        return None, f'  [missing]   {fp}\n', cache
+    out = io.StringIO()
+    with contextlib.redirect_stdout(out):
+        changed = convert_file(fp, dry_run=dry_run, cache=cache, use_ast=use_ast)
+    return changed, out.getvalue(), cache
+
+
 if __name__ == '__main__':
     dry_run = '--dry-run' in sys.argv
+    use_ast = '--ast' in sys.argv
     root = Path(__file__).parent.parent  # project root (ssd-testkit)
+    cache_path = root / CACHE_FILE
+    cache = _load_cache(cache_path)
 
-    changed = 0
+    # Files are independent and the work is CPU-bound, so convert them in
+    # separate processes
+    jobs = []
     for rel in TARGET_FILES:
         fp = root / rel
-        if not fp.exists():
-            print(f'  [missing]   {fp}')
-            continue
-        if convert_file(fp, dry_run=dry_run):
+        key = _cache_key(fp, use_ast)
+        entry = {key: cache[key]} if key in cache else {}
+        jobs.append((fp, dry_run, use_ast, entry))
+    workers = min(len(jobs), os.cpu_count() or 1)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        results = list(pool.map(_convert_worker, jobs))
+
+    changed = 0
+    for converted, report, entry in results:
+        sys.stdout.write(report)
+        cache.update(entry)
+        if converted:
             changed += 1
+    _save_cache(cache_path, cache)
 
     print(f'\nDone. {changed}/{len(TARGET_FILES)} files converted.')
@@ -24,10 +24,15 @@ Usage
 """
 
 import argparse
+import base64
+import hashlib
+import http.client
+import os
 import ssl
 import sys
+import time
+import urllib.parse
 import urllib.request
-import urllib.error
 from pathlib import Path
 
 # ---------------------------------------------------------------------------
@@ -46,6 +51,18 @@ _DEFAULT_OUTPUT_DIR = (
     _REPO_ROOT / "tests" / "unit" / "lib" / "testtool" / "bin" / "python_installer"
 )
 
+# Socket timeout for requests to the download server
+_TIMEOUT = 30  # seconds
+# HEAD probes fail fast, as before, when the server is unreachable
+_PROBE_TIMEOUT = 10  # seconds
+_MAX_REDIRECTS = 5
+
+# Read/write block size for the installer download
+_BLOCK_SIZE = 1 << 20  # 1 MB
+
+# Minimum seconds between progress bar redraws (at most 20 per second)
+_PROGRESS_INTERVAL = 0.05
+
 
 # ---------------------------------------------------------------------------
 # Helpers
@@ -61,7 +78,131 @@ def _make_ssl_context(verify: bool) -> ssl.SSLContext:
     return ctx
 
 
-def resolve_full_version(version: str, arch: str, ssl_context: ssl.SSLContext) -> str:
+class _Session:
+    """
+    Keep-alive HTTP(S) connections, one per scheme and host.
+
+    The version probe, the HEAD check and the download all go to the same
+    server, so sharing one connection pays for the TCP and TLS handshakes
+    once instead of once per request.
+
+    Like urllib's default opener, HTTP(S)_PROXY / NO_PROXY (or the Windows
+    proxy settings) are honoured: https goes through a CONNECT tunnel and
+    plain http sends absolute URLs to the proxy.
+    """
+
+    def __init__(self, ssl_context: ssl.SSLContext):
+        self._ssl_context = ssl_context
+        self._proxies = urllib.request.getproxies()
+        # (scheme, netloc) -> (connection, send absolute URL as the path)
+        self._conns: dict[tuple[str, str], tuple[http.client.HTTPConnection, bool]] = {}
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        headers: dict[str, str] | None = None,
+        timeout: float = _TIMEOUT,
+    ) -> http.client.HTTPResponse:
+        """
+        Send a request, following redirects, and return the response.
+        A response with a body must be read to the end before the next
+        request to the same host.
+        """
+        for _ in range(_MAX_REDIRECTS + 1):
+            parts = urllib.parse.urlsplit(url)
+            conn, absolute = self._connection(parts.scheme, parts.netloc)
+            if absolute:
+                path = url
+            else:
+                path = parts.path or "/"
+                if parts.query:
+                    path += "?" + parts.query
+            conn.timeout = timeout
+            reused = conn.sock is not None
+            try:
+                if reused:
+                    conn.sock.settimeout(timeout)
+                conn.request(method, path, headers=headers or {})
+                response = conn.getresponse()
+            except (http.client.HTTPException, OSError):
+                if not reused:
+                    raise  # a fresh connection failed: DNS, refused, timeout
+                # The server dropped the idle kept-alive socket; retry once
+                # on a new connection
+                conn.close()
+                conn.request(method, path, headers=headers or {})
+                response = conn.getresponse()
+            location = response.getheader("Location")
+            if response.status in (301, 302, 303, 307, 308) and location:
+                response.read()
+                url = urllib.parse.urljoin(url, location)
+                continue
+            return response
+        raise http.client.HTTPException(f"Too many redirects: {url}")
+
+    def _connection(
+        self, scheme: str, netloc: str
+    ) -> tuple[http.client.HTTPConnection, bool]:
+        cached = self._conns.get((scheme, netloc))
+        if cached is not None:
+            return cached
+
+        proxy = self._proxies.get(scheme)
+        host = urllib.parse.urlsplit(f"//{netloc}").hostname or netloc
+        if proxy and not urllib.request.proxy_bypass(host):
+            if "://" not in proxy:
+                proxy = f"http://{proxy}"
+            proxy_parts = urllib.parse.urlsplit(proxy)
+            proxy_headers = {}
+            if proxy_parts.username:
+                credentials = (
+                    f"{urllib.parse.unquote(proxy_parts.username)}:"
+                    f"{urllib.parse.unquote(proxy_parts.password or '')}"
+                )
+                proxy_headers["Proxy-Authorization"] = (
+                    "Basic " + base64.b64encode(credentials.encode()).decode("ascii")
+                )
+            proxy_netloc = f"{proxy_parts.hostname}:{proxy_parts.port or 80}"
+            if scheme == "https":
+                conn = http.client.HTTPSConnection(
+                    proxy_netloc, timeout=_TIMEOUT, context=self._ssl_context
+                )
+                conn.set_tunnel(netloc, headers=proxy_headers)
+                cached = (conn, False)
+            else:
+                conn = _ProxiedHTTPConnection(
+                    proxy_netloc, proxy_headers, timeout=_TIMEOUT
+                )
+                cached = (conn, True)
+        elif scheme == "https":
+            conn = http.client.HTTPSConnection(
+                netloc, timeout=_TIMEOUT, context=self._ssl_context
+            )
+            cached = (conn, False)
+        else:
+            cached = (http.client.HTTPConnection(netloc, timeout=_TIMEOUT), False)
+        self._conns[(scheme, netloc)] = cached
+        return cached
+
+    def close(self) -> None:
+        for conn, _ in self._conns.values():
+            conn.close()
+        self._conns.clear()
+
+
+class _ProxiedHTTPConnection(http.client.HTTPConnection):
+    """Plain-http connection to a proxy that adds its auth header to each request."""
+
+    def __init__(self, netloc: str, proxy_headers: dict[str, str], **kwargs):
+        super().__init__(netloc, **kwargs)
+        self._proxy_headers = proxy_headers
+
+    def request(self, method, url, body=None, headers={}, **kwargs):
+        super().request(method, url, body, {**headers, **self._proxy_headers}, **kwargs)
+
+
+def resolve_full_version(version: str, arch: str, session: _Session) -> str:
     """
     If version is 'MAJOR.MINOR', try to find the latest available patch release
     by probing the download server. Falls back to '<version>.0' on any error.
@@ -75,74 +216,198 @@ def resolve_full_version(version: str, arch: str, ssl_context: ssl.SSLContext) -
     url = _DOWNLOAD_URL_TEMPLATE.format(full_version=candidate, arch=arch)
     print(f"  Probing: {url}")
     try:
-        req = urllib.request.Request(url, method="HEAD")
-        urllib.request.urlopen(req, timeout=10, context=ssl_context)
-        return candidate
-    except urllib.error.HTTPError as exc:
-        print(f"  WARNING: HEAD request returned {exc.code}. Defaulting to {candidate}")
-        return candidate
+        response = session.request("HEAD", url, timeout=_PROBE_TIMEOUT)
+        response.read()
     except Exception as exc:
         print(f"  WARNING: Could not probe version ({exc}). Defaulting to {candidate}")
         return candidate
+    if response.status >= 400:
+        print(f"  WARNING: HEAD request returned {response.status}. Defaulting to {candidate}")
+        return candidate
+    return candidate
+
+
+def _head(session: _Session, url: str) -> tuple[int, str | None]:
+    """
+    Return (Content-Length, ETag) for url from a HEAD request,
+    or (0, None) if the server cannot be reached.
+    """
+    try:
+        response = session.request("HEAD", url, timeout=_PROBE_TIMEOUT)
+        response.read()
+    except Exception:
+        return 0, None
+    if response.status >= 400:
+        return 0, None
+    return (
+        int(response.getheader('Content-Length', 0)),
+        response.getheader('ETag'),
+    )
+
+
+def _file_sha256(path: Path) -> "hashlib._Hash":
+    """Return a sha256 object fed with the contents of path."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(_BLOCK_SIZE), b''):
+            digest.update(block)
+    return digest
 
 
 def download_installer(
-    full_version: str, arch: str, output_dir: Path, ssl_context: ssl.SSLContext
+    full_version: str,
+    arch: str,
+    output_dir: Path,
+    session: _Session,
+    expected_sha256: str | None = None,
 ) -> Path:
     """
     Download the Python installer to output_dir.
     Returns the local Path of the downloaded file.
-    Skips download if the file already exists.
+
+    Skips the download if the file already exists and still matches the
+    server's size and ETag (or the server cannot be reached). Data is
+    written to '<file>.part' and an interrupted download resumes from it
+    with a Range request.
+
+    The SHA256 of the file is computed while it is written and saved to
+    '<file>.sha256'. If expected_sha256 is given and does not match, the
+    file is deleted and RuntimeError is raised.
     """
+    if expected_sha256:
+        expected_sha256 = expected_sha256.strip().lower()
     output_dir.mkdir(parents=True, exist_ok=True)
     filename = f"python-{full_version}-{arch}.exe"
     dest = output_dir / filename
+    part = dest.with_name(filename + ".part")
+    etag_file = dest.with_name(filename + ".etag")
+    sha_file = dest.with_name(filename + ".sha256")
+
+    url = _DOWNLOAD_URL_TEMPLATE.format(full_version=full_version, arch=arch)
+
+    remote_size, etag = _head(session, url)
+    cached_etag = etag_file.read_text(encoding='utf-8') if etag_file.is_file() else None
 
     if dest.is_file():
-        print(f"  Already exists (skipping download): {dest}")
-        return dest
+        if etag is None or (
+            dest.stat().st_size == remote_size and cached_etag in (None, etag)
+        ):
+            if not expected_sha256:
+                print(f"  Already exists (skipping download): {dest}")
+                return dest
+            if sha_file.is_file():
+                actual = sha_file.read_text(encoding='utf-8').strip()
+            else:
+                actual = _file_sha256(dest).hexdigest()
+            if actual == expected_sha256:
+                print(f"  Already exists (skipping download): {dest}")
+                return dest
+            print(f"  SHA256 mismatch, downloading again: {dest}")
+        else:
+            print(f"  Remote file changed, downloading again: {dest}")
+        dest.unlink()
+        sha_file.unlink(missing_ok=True)
 
-    url = _DOWNLOAD_URL_TEMPLATE.format(full_version=full_version, arch=arch)
     print(f"  Downloading: {url}")
     print(f"  Saving to:   {dest}")
 
+    resume_from = part.stat().st_size if part.is_file() else 0
+    if remote_size and resume_from >= remote_size:
+        # Cannot be a valid prefix of the current file; start over
+        part.unlink()
+        resume_from = 0
+    headers = {}
+    if resume_from:
+        headers['Range'] = f'bytes={resume_from}-'
+        if cached_etag:
+            # Server sends the whole file (200) instead if it has changed
+            headers['If-Range'] = cached_etag
+
     try:
-        def _progress(block_num, block_size, total_size):
-            if total_size > 0:
-                downloaded = block_num * block_size
-                pct = min(downloaded * 100 // total_size, 100)
-                bar = "#" * (pct // 5)
-                sys.stdout.write(
-                    f"\r  [{bar:<20}] {pct:>3}%"
-                    f"  ({downloaded/1_048_576:.1f} / {total_size/1_048_576:.1f} MB)"
-                )
-                sys.stdout.flush()
-
-        # urllib.request.urlretrieve does not accept an ssl context directly;
-        # install an opener that uses our context.
-        https_handler = urllib.request.HTTPSHandler(context=ssl_context)
-        opener = urllib.request.build_opener(https_handler)
-        with opener.open(url) as response:
-            total_size = int(response.headers.get('Content-Length', 0))
-            block_size = 65536  # 64 KB
-            downloaded = 0
-            block_num = 0
-            with open(dest, 'wb') as f:
+        response = session.request("GET", url, headers)
+        if response.status == 416 and resume_from:
+            # Range not satisfiable: the .part does not fit the remote file
+            response.read()
+            print("  Partial download does not match the server, restarting")
+            part.unlink()
+            resume_from = 0
+            response = session.request("GET", url)
+        with response:
+            if response.status >= 400:
+                raise RuntimeError(f"HTTP {response.status} {response.reason}")
+            if response.status == 206:
+                print(f"  Resuming at: {resume_from / 1_048_576:.1f} MB")
+                mode = 'ab'
+            else:
+                resume_from = 0
+                mode = 'wb'
+            etag = response.getheader('ETag', etag)
+            if etag:
+                etag_file.write_text(etag, encoding='utf-8')
+            length = int(response.getheader('Content-Length', 0))
+            total_size = resume_from + length if length else 0
+            total_mb = f"{total_size / 1_048_576:.1f}"
+            # Hash while writing rather than reading the file back; only a
+            # resumed prefix has to be read from disk
+            digest = _file_sha256(part) if resume_from else hashlib.sha256()
+            # One reusable 1 MB buffer: fewer interpreter round trips per
+            # download and no new bytes object per block
+            buf = bytearray(_BLOCK_SIZE)
+            view = memoryview(buf)
+            downloaded = resume_from
+            last_print = 0.0
+            # No preallocation: the next run resumes from the size of .part,
+            # so it must only ever hold bytes actually received, even if this
+            # process is killed
+            with open(part, mode, buffering=_BLOCK_SIZE) as f:
                 while True:
-                    chunk = response.read(block_size)
-                    if not chunk:
+                    n = response.readinto(buf)
+                    if not n:
                         break
-                    f.write(chunk)
-                    downloaded += len(chunk)
-                    block_num += 1
-                    _progress(block_num, block_size, total_size)
+                    f.write(view[:n])
+                    digest.update(view[:n])
+                    downloaded += n
+                    if total_size <= 0:
+                        continue
+                    # Redraw at most every _PROGRESS_INTERVAL seconds, plus
+                    # once for the final block
+                    now = time.monotonic()
+                    if now - last_print < _PROGRESS_INTERVAL and downloaded < total_size:
+                        continue
+                    last_print = now
+                    pct = min(downloaded * 100 // total_size, 100)
+                    bar = "#" * (pct // 5)
+                    pad = " " * (20 - len(bar))
+                    sys.stdout.write(
+                        f"\r  [{bar}{pad}] {pct:>3}%"
+                        f"  ({downloaded / 1_048_576:.1f} / {total_mb} MB)"
+                    )
+                    sys.stdout.flush()
+                # Make the data durable before the rename below, then
+                # tell the kernel the written pages need not stay cached
+                f.flush()
+                os.fsync(f.fileno())
+                if hasattr(os, 'posix_fadvise'):
+                    os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_DONTNEED)
         print()  # newline after progress bar
+        if total_size and downloaded != total_size:
+            raise RuntimeError(
+                f"incomplete download ({downloaded} of {total_size} bytes)"
+            )
+        actual = digest.hexdigest()
+        if expected_sha256 and actual != expected_sha256:
+            part.unlink()
+            raise RuntimeError(
+                f"SHA256 mismatch (expected {expected_sha256}, got {actual})"
+            )
+        part.replace(dest)
+        sha_file.write_text(actual, encoding='utf-8')
     except Exception as exc:
-        if dest.exists():
-            dest.unlink()
-        raise RuntimeError(f"Download failed: {exc}") from exc
+        hint = f" (partial data kept in {part}; run again to resume)" if part.exists() else ""
+        raise RuntimeError(f"Download failed: {exc}{hint}") from exc
 
     print(f"  Download complete: {dest}")
+    print(f"  SHA256: {actual}")
     return dest
 
 
@@ -171,6 +436,12 @@ def parse_args() -> argparse.Namespace:
         default=str(_DEFAULT_OUTPUT_DIR),
         help=f"Directory to save the installer (default: {_DEFAULT_OUTPUT_DIR}).",
     )
+    parser.add_argument(
+        "--expected-sha256",
+        default=None,
+        help="SHA256 published for the installer on python.org; the download "
+             "is deleted if it does not match.",
+    )
     parser.add_argument(
         "--no-verify-ssl",
         action="store_true",
@@ -194,17 +465,25 @@ def main() -> int:
     print(f"  Output dir  : {output_dir}")
     print()
 
-    print(f"[1/2] Resolving full version ...")
-    full_version = resolve_full_version(args.version, args.arch, ssl_context)
-    print(f"      Full version: {full_version}")
-    print()
-
-    print(f"[2/2] Downloading installer ...")
+    # One session for both steps so the download reuses the probe's connection
+    session = _Session(ssl_context)
     try:
-        dest = download_installer(full_version, args.arch, output_dir, ssl_context)
-    except RuntimeError as exc:
-        print(f"\nERROR: {exc}", file=sys.stderr)
-        return 1
+        print(f"[1/2] Resolving full version ...")
+        full_version = resolve_full_version(args.version, args.arch, session)
+        print(f"      Full version: {full_version}")
+        print()
+
+        print(f"[2/2] Downloading installer ...")
+        try:
+            dest = download_installer(
+                full_version, args.arch, output_dir, session,
+                expected_sha256=args.expected_sha256,
+            )
+        except RuntimeError as exc:
+            print(f"\nERROR: {exc}", file=sys.stderr)
+            return 1
+    finally:
+        session.close()
 
     print()
     print(f"Done. Installer saved to:")